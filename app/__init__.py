@@ -1,30 +1,83 @@
+import os
 import json
 from flask import Flask
+from sqlalchemy import event
 from flask_login import LoginManager
-from flask_migrate import Migrate
 from config import Config
-from app.models import db, User
+from app.models import db, close_read_session
 
 login_manager = LoginManager()
-migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def configure_sqlite_pragmas(app):
+    """Apply SQLITE_PRAGMAS to every new connection of the app's SQLite engines"""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite' and pragmas:
+                event.listen(engine, 'connect', set_pragmas)
+
+
+def configure_jinja(app):
+    """
+    Cache compiled templates on disk (JINJA_BYTECODE_CACHE_DIR).
+    Workers then load bytecode instead of compiling each template on first
+    use; scripts/precompile_templates.py fills the cache at build time.
+    """
+    if not app.config.get('JINJA_BYTECODE_CACHE'):
+        return
+    
+    from jinja2 import FileSystemBytecodeCache
+    directory = app.config.get('JINJA_BYTECODE_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(directory, exist_ok=True)
+    # Must be set before app.jinja_env is first used, which creates the environment
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(directory)}
+
+
+def init_migrate(app):
+    """
+    Set up Flask-Migrate on demand.
+    It pulls in Alembic, which web workers never use, so create_app only
+    loads it for `flask` CLI commands; schema scripts call this directly.
+    """
+    if 'migrate' in app.extensions:
+        return app.extensions['migrate']
+    
+    from flask_migrate import Migrate
+    return Migrate(app, db, directory=MIGRATIONS_DIR)
+
 
 def create_app(config_class=Config):
     """Application factory pattern"""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    configure_jinja(app)
     
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
+    configure_sqlite_pragmas(app)
+    app.teardown_appcontext(close_read_session)
+    
+    # Flask sets FLASK_RUN_FROM_CLI for every `flask ...` command (db, init-db, run)
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        init_migrate(app)
     
     # Configure login manager
     login_manager.login_view = 'main.login'
     login_manager.login_message = 'Please log in to access this page.'
     
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.get(int(user_id))
+    from app.identity import load_user
+    login_manager.user_loader(load_user)
     
     # Register custom Jinja2 filters
     @app.template_filter('from_json')
@@ -37,6 +90,21 @@ def create_app(config_class=Config):
         except (json.JSONDecodeError, TypeError):
             return []
     
+    from app.compression import init_compression
+    init_compression(app)
+    
+    from app.storage import init_storage
+    init_storage(app)
+    
+    from app.fragments import init_fragment_cache
+    init_fragment_cache(app)
+    
+    from app.preload import init_preload
+    init_preload(app)
+    
+    from app.throttle import init_throttle
+    init_throttle(app)
+    
     # Register blueprints
     from app.routes import main
     app.register_blueprint(main)
@@ -0,0 +1,332 @@
+"""
+Server-rendered SVG charts of the Titanic data
+
+Three chart types, drawn as plain inline SVG (no client-side library):
+
+    bar        passenger counts per group, optionally stacked by a second dimension
+    histogram  distribution of age or fare, optionally stacked
+    survival   survival rate per group
+
+A chart is described by a spec, e.g. {'type': 'survival', 'by': 'pclass'}.
+Project Markdown embeds one with a shortcode on its own line:
+
+    [chart type=survival by=pclass]
+    [chart type=histogram column=age bins=16 split=survived dataset=test_true]
+    [chart type=bar by=embarked split=survived sex=Female title="Women by port"]
+
+Filters are the explorer's: pclass, sex, embarked, survived (comma-separated
+labels) and age_min/age_max/fare_min/fare_max.
+
+Rendered SVG is cached per worker, keyed by a hash of the dataset file's
+mtime and the spec, so each chart is computed once until the data changes.
+"""
+import hashlib
+import json
+import math
+import re
+import shlex
+import threading
+from collections import OrderedDict
+import numpy as np
+from markupsafe import Markup, escape
+from app import titanic
+
+CHART_TYPES = ('bar', 'histogram', 'survival')
+HISTOGRAM_COLUMNS = {'age': ('Age', 'Age (years)'), 'fare': ('Fare', 'Fare (£)')}
+FILTER_NAMES = ('pclass', 'sex', 'embarked', 'survived')
+
+WIDTH, HEIGHT = 640, 320
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 52, 16, 36, 44
+PALETTE = ['#0d6efd', '#fd7e14', '#6f42c1', '#20c997', '#d63384', '#ffc107', '#6c757d']
+OUTCOME_COLOURS = ['#adb5bd', '#198754']
+
+SHORTCODE_PATTERN = re.compile(r'^[ \t]*\[chart(?P<args>[^\]\n]*)\][ \t]*$', re.MULTILINE)
+PLACEHOLDER = 'PORTFOLIOCHART{}X'
+CHART_CACHE_SIZE = 256
+
+_chart_cache = OrderedDict()
+_chart_lock = threading.Lock()
+
+
+class ChartError(ValueError):
+    """A chart spec that cannot be drawn"""
+
+
+def parse_spec(params):
+    """Validate chart parameters (strings) and return a normalized spec"""
+    chart_type = params.get('type')
+    if chart_type not in CHART_TYPES:
+        raise ChartError(f"type must be one of {', '.join(CHART_TYPES)}")
+
+    dataset = params.get('dataset', 'train')
+    if dataset not in titanic.DATASETS:
+        raise ChartError(f"dataset must be one of {', '.join(titanic.DATASETS)}")
+
+    spec = {'type': chart_type, 'dataset': dataset}
+    if chart_type == 'histogram':
+        column = params.get('column', 'age')
+        if column not in HISTOGRAM_COLUMNS:
+            raise ChartError(f"column must be one of {', '.join(HISTOGRAM_COLUMNS)}")
+        try:
+            bins = int(params.get('bins', 16))
+        except ValueError:
+            raise ChartError('bins must be a whole number')
+        spec.update(column=column, bins=min(max(bins, 2), 60))
+    else:
+        by = params.get('by', 'pclass')
+        if by not in titanic.DIMENSIONS or (chart_type == 'survival' and by == 'survived'):
+            raise ChartError(f'cannot group by {by!r}')
+        spec['by'] = by
+
+    if chart_type != 'survival' and params.get('split'):
+        if params['split'] not in titanic.DIMENSIONS:
+            raise ChartError(f"cannot split by {params['split']!r}")
+        spec['split'] = params['split']
+
+    # Filters use the explorer's labels, e.g. sex=Female pclass=1st,2nd
+    options = titanic.filter_options(dataset)
+    filters = {}
+    for name in FILTER_NAMES:
+        if params.get(name):
+            labels = {label.lower(): label for label in options[name]}
+            wanted = [value.strip().lower() for value in params[name].split(',')]
+            unknown = [value for value in wanted if value not in labels]
+            if unknown:
+                raise ChartError(f"unknown {name} value {unknown[0]!r}")
+            filters[name] = [labels[value] for value in wanted]
+    for name in ('age_min', 'age_max', 'fare_min', 'fare_max'):
+        if params.get(name):
+            try:
+                filters[name] = float(params[name])
+            except ValueError:
+                raise ChartError(f'{name} must be a number')
+            if not math.isfinite(filters[name]):
+                raise ChartError(f'{name} must be a finite number')
+    if filters:
+        spec['filters'] = filters
+
+    if params.get('title'):
+        spec['title'] = params['title'][:120]
+    return spec
+
+
+def default_title(spec):
+    dimensions = titanic.DIMENSIONS
+    if spec['type'] == 'survival':
+        title = f"Survival rate by {dimensions[spec['by']].lower()}"
+    elif spec['type'] == 'histogram':
+        title = f"{HISTOGRAM_COLUMNS[spec['column']][0]} distribution"
+    else:
+        title = f"Passengers by {dimensions[spec['by']].lower()}"
+    if spec.get('split'):
+        title += f" and {dimensions[spec['split']].lower()}"
+    for name in FILTER_NAMES:
+        if name in spec.get('filters', {}):
+            title += f" ({', '.join(spec['filters'][name])})"
+    return title
+
+
+def explorer_charts(dataset, filters, group_dimensions):
+    """Charts shown on the explorer page for its current query"""
+    filters = {name: value for name, value in filters.items() if value not in (None, [])}
+    by = next((name for name in group_dimensions if name != 'survived'), 'pclass')
+    specs = [
+        {'type': 'survival', 'dataset': dataset, 'by': by},
+        {'type': 'histogram', 'dataset': dataset, 'column': 'age', 'bins': 16, 'split': 'survived'},
+    ]
+    for spec in specs:
+        if filters:
+            spec['filters'] = filters
+    return [render_chart(spec) for spec in specs]
+
+
+def render_chart(spec):
+    """SVG markup for a normalized spec, from the cache when the data hasn't changed"""
+    mtime = titanic.dataset_mtime(spec['dataset'])
+    key = hashlib.sha256(json.dumps([mtime, spec], sort_keys=True).encode('utf-8')).hexdigest()
+
+    with _chart_lock:
+        svg = _chart_cache.get(key)
+        if svg is not None:
+            _chart_cache.move_to_end(key)
+            return Markup(svg)
+
+    svg = _draw(spec)
+    with _chart_lock:
+        _chart_cache[key] = svg
+        while len(_chart_cache) > CHART_CACHE_SIZE:
+            _chart_cache.popitem(last=False)
+    return Markup(svg)
+
+
+def _draw(spec):
+    table = titanic.get_table(spec['dataset'])
+    mask = titanic.build_mask(table, spec.get('filters', {}))
+    title = spec.get('title') or default_title(spec)
+
+    if spec['type'] == 'survival':
+        codes, labels = table.dimension(spec['by'])
+        selected = np.asarray(codes)[mask]
+        counts = np.bincount(selected, minlength=len(labels))
+        survivors = np.bincount(selected, weights=np.asarray(table['Survived'])[mask], minlength=len(labels))
+        shown = np.flatnonzero(counts)
+        return _horizontal_bars(title, [labels[i] for i in shown], survivors[shown] / counts[shown], counts[shown])
+
+    if spec['type'] == 'histogram':
+        column_name, axis_label = HISTOGRAM_COLUMNS[spec['column']]
+        values = np.asarray(table[column_name])
+        known = mask & ~np.isnan(values)
+        low, high = (values[known].min(), values[known].max()) if known.any() else (0, 1)
+        edges = np.histogram_bin_edges(values[known], bins=spec['bins'], range=(low, max(high, low + 1)))
+        categories = [f'{edge:g}' for edge in np.round(edges[:-1], 1)]
+        series = _split_series(table, known, spec.get('split'),
+                               lambda rows: np.histogram(values[rows], bins=edges)[0])
+        return _vertical_bars(title, categories, series, axis_label, edges=edges)
+
+    codes, labels = table.dimension(spec['by'])
+    codes = np.asarray(codes)
+    series = _split_series(table, mask, spec.get('split'),
+                           lambda rows: np.bincount(codes[rows], minlength=len(labels)))
+    shown = np.flatnonzero(sum(values for _, values, _ in series))
+    series = [(name, values[shown], colour) for name, values, colour in series]
+    return _vertical_bars(title, [labels[i] for i in shown], series, titanic.DIMENSIONS[spec['by']])
+
+
+def _split_series(table, mask, split, count):
+    """[(name, counts, colour)] for the rows in mask, one series per value of split"""
+    if not split:
+        return [('Passengers', count(mask), PALETTE[0])]
+    codes, labels = table.dimension(split)
+    codes = np.asarray(codes)
+    colours = OUTCOME_COLOURS if split == 'survived' else PALETTE
+    return [
+        (label, count(mask & (codes == code)), colours[code % len(colours)])
+        for code, label in enumerate(labels)
+        if (mask & (codes == code)).any()
+    ]
+
+
+def _nice_step(maximum, ticks=5):
+    """Round tick spacing (1, 2 or 5 times a power of ten) for an axis up to maximum"""
+    raw = max(maximum, 1) / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 5, 10):
+        if raw <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def _svg(title, body):
+    return (
+        f'<svg class="chart" viewBox="0 0 {WIDTH} {HEIGHT}" xmlns="http://www.w3.org/2000/svg" '
+        f'role="img" aria-label="{escape(title)}" font-family="system-ui, sans-serif" font-size="11">'
+        f'<title>{escape(title)}</title>'
+        f'<text x="{WIDTH / 2}" y="20" text-anchor="middle" font-size="14" font-weight="600">{escape(title)}</text>'
+        f'{"".join(body)}</svg>'
+    )
+
+
+def _legend(series):
+    if len(series) < 2:
+        return []
+    parts = []
+    x = WIDTH - MARGIN_RIGHT
+    for name, _, colour in reversed(series):
+        width = 18 + 6.5 * len(name)
+        x -= width
+        parts.append(f'<rect x="{x:.1f}" y="{MARGIN_TOP - 12}" width="10" height="10" fill="{colour}"/>'
+                     f'<text x="{x + 14:.1f}" y="{MARGIN_TOP - 3}">{escape(name)}</text>')
+    return parts
+
+
+def _vertical_bars(title, categories, series, axis_label, edges=None):
+    """Stacked vertical bars; series is [(name, values per category, colour)]"""
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    totals = sum(values for _, values, _ in series) if series else np.zeros(len(categories))
+    step = _nice_step(float(np.max(totals, initial=0)))
+    top = step * max(math.ceil(float(np.max(totals, initial=0)) / step), 1)
+    scale = plot_height / top
+    baseline = MARGIN_TOP + plot_height
+
+    body = []
+    for tick in np.arange(0, top + step / 2, step):
+        y = baseline - tick * scale
+        body.append(f'<line x1="{MARGIN_LEFT}" x2="{WIDTH - MARGIN_RIGHT}" y1="{y:.1f}" y2="{y:.1f}" stroke="#e9ecef"/>'
+                    f'<text x="{MARGIN_LEFT - 6}" y="{y + 4:.1f}" text-anchor="end" fill="#6c757d">{tick:g}</text>')
+
+    slot = plot_width / max(len(categories), 1)
+    gap = 0 if edges is not None else slot * 0.2
+    bottoms = np.zeros(len(categories))
+    for name, values, colour in series:
+        for i, value in enumerate(values):
+            if not value:
+                continue
+            height = value * scale
+            y = baseline - bottoms[i] * scale - height
+            body.append(f'<rect x="{MARGIN_LEFT + i * slot + gap / 2:.1f}" y="{y:.1f}" width="{slot - gap - (1 if edges is not None else 0):.1f}" '
+                        f'height="{height:.1f}" fill="{colour}"><title>{escape(categories[i])}: {escape(name)} {int(value)}</title></rect>')
+        bottoms += values
+
+    # Histograms label every few bin edges; bar charts label every category
+    every = max(1, math.ceil(len(categories) / 8)) if edges is not None else 1
+    for i, label in enumerate(categories):
+        if i % every:
+            continue
+        x = MARGIN_LEFT + i * slot + (0 if edges is not None else slot / 2)
+        body.append(f'<text x="{x:.1f}" y="{baseline + 15}" text-anchor="middle" fill="#495057">{escape(label)}</text>')
+    body.append(f'<line x1="{MARGIN_LEFT}" x2="{WIDTH - MARGIN_RIGHT}" y1="{baseline}" y2="{baseline}" stroke="#495057"/>')
+    body.append(f'<text x="{MARGIN_LEFT + plot_width / 2}" y="{HEIGHT - 8}" text-anchor="middle" fill="#495057">{escape(axis_label)}</text>')
+    body.extend(_legend(series))
+    return _svg(title, body)
+
+
+def _horizontal_bars(title, labels, rates, counts):
+    """One horizontal bar per group, length = survival rate"""
+    label_width = 150
+    plot_left = MARGIN_LEFT + label_width - 40
+    plot_width = WIDTH - plot_left - MARGIN_RIGHT - 70
+    row_height = (HEIGHT - MARGIN_TOP - 16) / max(len(labels), 1)
+    bar_height = min(row_height * 0.7, 28)
+
+    body = []
+    for tick in (0, 0.25, 0.5, 0.75, 1):
+        x = plot_left + tick * plot_width
+        body.append(f'<line x1="{x:.1f}" x2="{x:.1f}" y1="{MARGIN_TOP}" y2="{HEIGHT - 16}" stroke="#e9ecef"/>'
+                    f'<text x="{x:.1f}" y="{HEIGHT - 4}" text-anchor="middle" fill="#6c757d">{tick:.0%}</text>')
+
+    for i, (label, rate, count) in enumerate(zip(labels, rates, counts)):
+        y = MARGIN_TOP + i * row_height + (row_height - bar_height) / 2
+        body.append(f'<text x="{plot_left - 8}" y="{y + bar_height / 2 + 4:.1f}" text-anchor="end" fill="#495057">{escape(label)}</text>'
+                    f'<rect x="{plot_left}" y="{y:.1f}" width="{rate * plot_width:.1f}" height="{bar_height:.1f}" fill="{OUTCOME_COLOURS[1]}">'
+                    f'<title>{escape(label)}: {rate:.1%} of {int(count)}</title></rect>'
+                    f'<text x="{plot_left + rate * plot_width + 6:.1f}" y="{y + bar_height / 2 + 4:.1f}">{rate:.0%} '
+                    f'<tspan fill="#6c757d">(n={int(count)})</tspan></text>')
+    return _svg(title, body)
+
+
+def extract_chart_shortcodes(text):
+    """Swap [chart ...] lines for placeholders before Markdown; returns (text, specs or errors)"""
+    charts = []
+
+    def replace(match):
+        try:
+            params = dict(part.split('=', 1) for part in shlex.split(match.group('args')) if '=' in part)
+            charts.append(parse_spec(params))
+        except (ChartError, ValueError) as e:
+            charts.append(ChartError(str(e)))
+        return PLACEHOLDER.format(len(charts) - 1)
+
+    return SHORTCODE_PATTERN.sub(replace, text), charts
+
+
+def insert_charts(html, charts):
+    """Replace the placeholders left by extract_chart_shortcodes with rendered charts"""
+    for index, chart in enumerate(charts):
+        if isinstance(chart, ChartError):
+            figure = f'<div class="alert alert-warning">Chart error: {escape(chart)}</div>'
+        else:
+            figure = f'<figure class="chart-figure">{render_chart(chart)}</figure>'
+        placeholder = PLACEHOLDER.format(index)
+        html = html.replace(f'<p>{placeholder}</p>', figure).replace(placeholder, figure)
+    return html
@@ -0,0 +1,147 @@
+"""
+Binary columnar storage for the data/ CSVs
+
+scripts/convert_data.py writes each CSV to a directory of .npy files:
+
+    data/columnar/train/
+        meta.json               row count, column kinds, category labels, source CSV size/mtime
+        PassengerId.npy         numeric columns and category codes, one array each
+        Name.codes.npy          text columns, dictionary-encoded: int32 index per row
+        Name.offsets.npy        start of each dictionary entry in Name.strings.npy (+ end)
+        Name.strings.npy        the distinct values as one UTF-8 byte array
+
+Arrays are opened with np.load(mmap_mode='r'), so loading takes
+milliseconds and every gunicorn worker shares the same page-cache pages
+instead of holding its own parsed copy.
+"""
+import json
+import os
+import shutil
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+class StringColumn:
+    """Dictionary-encoded text column; values are decoded on access"""
+
+    def __init__(self, codes, offsets, strings):
+        self.codes = codes
+        self.offsets = offsets
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.codes)
+
+    def value(self, code):
+        start, end = self.offsets[code], self.offsets[code + 1]
+        return bytes(self.strings[start:end]).decode('utf-8')
+
+    def __getitem__(self, index):
+        codes = self.codes[index]
+        if np.ndim(codes) == 0:
+            return self.value(int(codes))
+        return np.array([self.value(int(code)) for code in codes], dtype=object)
+
+
+def encode_strings(values):
+    """(codes, offsets, strings) for an array of str"""
+    dictionary, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    encoded = [value.encode('utf-8') for value in dictionary.tolist()]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    strings = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return codes.astype(np.int32), offsets, strings
+
+
+def compact_integers(column):
+    """Smallest signed integer dtype that holds every value"""
+    if len(column) == 0:
+        return column
+    low, high = int(column.min()), int(column.max())
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return column.astype(dtype)
+    return column
+
+
+def source_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'name': os.path.basename(csv_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_table(table, kinds, csv_path, out_dir):
+    """Write a parsed table to out_dir, replacing any previous conversion atomically"""
+    temp_dir = out_dir + '.tmp'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+
+    columns = {}
+    for name, column in table.columns.items():
+        kind = kinds.get(name, 'text')
+        columns[name] = {'kind': kind}
+        if kind == 'text':
+            codes, offsets, strings = encode_strings(column)
+            np.save(os.path.join(temp_dir, f'{name}.codes.npy'), codes)
+            np.save(os.path.join(temp_dir, f'{name}.offsets.npy'), offsets)
+            np.save(os.path.join(temp_dir, f'{name}.strings.npy'), strings)
+            columns[name]['distinct'] = len(offsets) - 1
+        else:
+            if kind == 'int':
+                column = compact_integers(column)
+            np.save(os.path.join(temp_dir, f'{name}.npy'), np.ascontiguousarray(column))
+            if name in table.categories:
+                columns[name]['labels'] = table.categories[name]
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'rows': table.rows,
+        'source': source_signature(csv_path),
+        'columns': columns,
+    }
+    with open(os.path.join(temp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    # Swap directories so readers never see a half-written conversion
+    old_dir = out_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, old_dir)
+    os.rename(temp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return meta
+
+
+def read_meta(out_dir, csv_path=None):
+    """meta.json of a conversion, or None if missing, outdated or from another format version"""
+    try:
+        with open(os.path.join(out_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('format') != FORMAT_VERSION:
+        return None
+    if csv_path and os.path.exists(csv_path):
+        source = source_signature(csv_path)
+        if (meta['source']['size'], meta['source']['mtime_ns']) != (source['size'], source['mtime_ns']):
+            return None
+    return meta
+
+
+def load_columns(out_dir, meta):
+    """Memory-map every column of a conversion read-only; returns (columns, categories)"""
+    columns = {}
+    categories = {}
+    for name, info in meta['columns'].items():
+        if info['kind'] == 'text':
+            columns[name] = StringColumn(
+                np.load(os.path.join(out_dir, f'{name}.codes.npy'), mmap_mode='r'),
+                np.load(os.path.join(out_dir, f'{name}.offsets.npy'), mmap_mode='r'),
+                np.load(os.path.join(out_dir, f'{name}.strings.npy'), mmap_mode='r'),
+            )
+        else:
+            columns[name] = np.load(os.path.join(out_dir, f'{name}.npy'), mmap_mode='r')
+            if 'labels' in info:
+                categories[name] = info['labels']
+    return columns, categories
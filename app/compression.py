@@ -0,0 +1,127 @@
+"""
+Response compression for HTML, CSS, JS, JSON and other text responses
+
+Negotiates Brotli (when the optional `brotli` package is installed) or gzip
+from Accept-Encoding. Images and other already-compressed types are left
+alone, as are bodies smaller than COMPRESS_MIN_SIZE.
+
+Compressed bodies are cached per worker, keyed by the ETag of the
+uncompressed body and the encoding. Identical pages are then compressed
+once rather than on every hit. Each encoding gets its own ETag, so
+conditional requests and caches never mix variants.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/javascript', 'application/json', 'application/xml',
+    'application/atom+xml', 'image/svg+xml',
+}
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies with a total size budget"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._items[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+def choose_encoding(accept_encodings):
+    """Supported encoding with the highest q-value the client accepts (br on ties), or None"""
+    available = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best = max(available, key=accept_encodings.quality)
+    return best if accept_encodings.quality(best) > 0 else None
+
+
+def compress(data, encoding, config):
+    """Compress a body with the given encoding"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BR_LEVEL'])
+    # mtime=0 keeps identical input producing identical output
+    return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+
+def init_compression(app):
+    """Register the compression after_request hook on the app"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BR_LEVEL', 5)
+    app.config.setdefault('COMPRESS_CACHE_MAX_BYTES', 8 * 1024 * 1024)
+
+    cache = CompressedBodyCache(app.config['COMPRESS_CACHE_MAX_BYTES'])
+    app.extensions['compression_cache'] = cache
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config['COMPRESS_ENABLED'] or request.method != 'GET':
+            return response
+        if response.status_code != 200 or 'Content-Encoding' in response.headers:
+            return response
+        # Generators are left alone; file responses (direct_passthrough) have a known size
+        if response.is_streamed and not response.direct_passthrough:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        if 'no-transform' in response.headers.get('Cache-Control', ''):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        # Static files are sent as pass-through file wrappers; read them into memory
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        etag, _ = response.get_etag()
+        if not etag:
+            etag = hashlib.sha1(data).hexdigest()
+
+        key = (etag, encoding)
+        body = cache.get(key)
+        if body is None:
+            body = compress(data, encoding, app.config)
+            if 'no-store' not in response.headers.get('Cache-Control', ''):
+                cache.set(key, body)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f'{etag}-{encoding}')
+        return response.make_conditional(request)
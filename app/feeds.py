@@ -0,0 +1,70 @@
+"""
+Sitemap and Atom feed of published projects
+
+Both documents are rendered only when the projects change. Each request
+runs one aggregate query (project count, latest updated_at, latest profile
+update) as a fingerprint. The rendered XML is reused while the fingerprint
+matches, and it also serves as the ETag, so crawlers polling with
+If-None-Match or If-Modified-Since get a 304 without any rendering.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from flask import render_template, request, current_app
+from sqlalchemy import func, select
+from app.models import User, Project, read_session
+
+# Rendered documents per worker: (name, host) -> (fingerprint, body, etag, last_modified).
+# The host comes from the client's Host header, so the cache is a small LRU rather than
+# growing with every value a client sends.
+DOCUMENT_CACHE_SIZE = 8
+_documents = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def content_fingerprint(session):
+    """Cheap summary that changes whenever a project (or the profile) is added, edited or deleted"""
+    count, projects_updated = session.execute(
+        select(func.count(Project.id), func.max(Project.updated_at))
+    ).one()
+    profile_updated = session.execute(select(func.max(User.updated_at))).scalar()
+    return count, projects_updated, profile_updated
+
+
+def _render(name):
+    reader = read_session()
+    user = reader.query(User).first()
+    projects = reader.query(Project).filter_by(published=True).order_by(Project.updated_at.desc()).all()
+    updated = max((project.updated_at for project in projects), default=None) or datetime.utcnow()
+    template = 'sitemap.xml' if name == 'sitemap' else 'feed.atom.xml'
+    return render_template(template, user=user, projects=projects, updated=updated), updated
+
+
+def xml_response(name, mimetype):
+    """Conditional response for the sitemap or feed, rendered only if projects changed"""
+    fingerprint = content_fingerprint(read_session())
+    # Absolute URLs depend on the host the request came in on
+    key = (name, request.host_url)
+
+    with _documents_lock:
+        cached = _documents.get(key)
+        if cached is not None:
+            _documents.move_to_end(key)
+    if cached is None or cached[0] != fingerprint:
+        body, updated = _render(name)
+        etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        cached = (fingerprint, body, etag, updated)
+        with _documents_lock:
+            _documents[key] = cached
+            _documents.move_to_end(key)
+            while len(_documents) > DOCUMENT_CACHE_SIZE:
+                _documents.popitem(last=False)
+
+    _, body, etag, updated = cached
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.last_modified = updated
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
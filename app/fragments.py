@@ -0,0 +1,121 @@
+"""
+Template fragment caching
+
+Adds a `{% cache %}` tag to Jinja. The rendered markup of the block is
+stored under the tag's key and reused until the key changes:
+
+    {% cache 'project-card', project.id, project.updated_at %}
+        ...
+    {% endcache %}
+
+Keys should include whatever the fragment shows, typically a row id and its
+updated_at, so an edit renders a fresh copy. The template name and line are
+added to every key, so the same key in two places never collides. Anything
+that varies per visitor (e.g. the admin buttons) stays outside the tag.
+
+Backends (FRAGMENT_CACHE_BACKEND):
+    memory  per-worker LRU with a size limit and a timeout
+    off     no caching; every fragment renders as before
+Any object with get(key) and set(key, value, timeout) can be installed as
+app.extensions['fragment_cache'] instead.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+
+class MemoryBackend:
+    """Thread-safe LRU of rendered fragments, each with its own expiry"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._items = OrderedDict()  # key -> (expires_at, markup)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._items[key] = (time.monotonic() + timeout, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+}
+
+
+def fragment_timeout(app):
+    """
+    Seconds a fragment may be reused.
+    Presigned S3 URLs expire, so fragments containing them are kept for at
+    most half of the time such a URL is still guaranteed to be valid.
+    """
+    timeout = app.config.get('FRAGMENT_CACHE_TIMEOUT', 3600)
+    storage = app.extensions.get('storage')
+    url_lifetime = getattr(storage, 'url_lifetime', None)
+    if url_lifetime:
+        timeout = min(timeout, url_lifetime / 2)
+    return timeout
+
+
+class FragmentCacheExtension(Extension):
+    """The {% cache key, ... %} ... {% endcache %} tag"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+
+        prefix = nodes.Const(f'{parser.name}:{lineno}')
+        call = self.call_method('_render', [prefix, nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, prefix, parts, caller):
+        cache = current_app.extensions.get('fragment_cache')
+        if cache is None:
+            return caller()
+
+        key = '|'.join([prefix, *map(str, parts)])
+        markup = cache.get(key)
+        if markup is None:
+            markup = caller()
+            cache.set(key, markup, fragment_timeout(current_app))
+        return markup
+
+
+def init_fragment_cache(app):
+    """Register the {% cache %} tag and the backend selected by FRAGMENT_CACHE_BACKEND"""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    name = (app.config.get('FRAGMENT_CACHE_BACKEND') or 'off').lower()
+    if name == 'off':
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown FRAGMENT_CACHE_BACKEND {name!r}; use one of: {', '.join(BACKENDS)}, off")
+
+    cache = BACKENDS[name](app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 1000))
+    app.extensions['fragment_cache'] = cache
+    return cache
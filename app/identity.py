@@ -0,0 +1,81 @@
+"""
+Cached user loader for Flask-Login
+
+Logged-in admin requests would otherwise load the User row on every page.
+Each worker keeps a detached copy of the user, and the session cookie
+carries a version fingerprint of it. When the profile or password changes,
+the fingerprint changes, so every worker reloads the row on its next request.
+"""
+import hashlib
+import time
+from flask import session, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from app.models import db, User
+
+SESSION_KEY = '_identity_version'
+
+# user_id -> (version, expires_at, detached User copy)
+_identity_cache = {}
+
+
+def user_version(user):
+    """Fingerprint that changes whenever the profile or password changes"""
+    raw = f'{user.password_hash}|{user.updated_at}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def remember_identity(user):
+    """Embed the user's current version in the session cookie"""
+    version = user_version(user)
+    if session.get(SESSION_KEY) != version:
+        session[SESSION_KEY] = version
+    return version
+
+
+def forget_identity():
+    """Remove the identity version from the session (on logout)"""
+    session.pop(SESSION_KEY, None)
+
+
+def invalidate_identity(user_id):
+    """Drop this worker's cached copy of a user"""
+    _identity_cache.pop(user_id, None)
+
+
+def _detached_copy(user):
+    """Copy of a loaded user that can be merged into later sessions without a query"""
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def load_user(user_id):
+    """Flask-Login user loader backed by the identity cache"""
+    user_id = int(user_id)
+    version = session.get(SESSION_KEY)
+    cached = _identity_cache.get(user_id)
+
+    if cached and version == cached[0] and cached[1] > time.monotonic():
+        # load=False attaches the copy to this request's session without a SELECT
+        return db.session.merge(cached[2], load=False)
+
+    user = db.session.get(User, user_id)
+    if user is None:
+        invalidate_identity(user_id)
+        return None
+
+    ttl = current_app.config.get('USER_CACHE_TTL', 300)
+    _identity_cache[user_id] = (remember_identity(user), time.monotonic() + ttl, _detached_copy(user))
+    return user
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    """Profile or password changed: stop serving the cached copy"""
+    invalidate_identity(target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    invalidate_identity(target.id)
@@ -0,0 +1,72 @@
+"""
+Upload normalization for images
+
+Photos straight from a phone or camera carry EXIF blobs, GPS data and
+embedded thumbnails, are often rotated only by an EXIF flag, and can be
+far larger than any page shows them. Each upload is re-encoded once:
+rotated upright, metadata stripped, downscaled to IMAGE_MAX_DIMENSION.
+Its intrinsic size is recorded so templates can emit width/height.
+"""
+import os
+
+SAVE_OPTIONS = {
+    'JPEG': {'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'GIF': {'optimize': True},
+}
+
+
+def normalize_image(path, max_dimension=2000, jpeg_quality=85):
+    """
+    Rewrite the image at path without metadata, upright and within
+    max_dimension, and return its (width, height).
+    Raises ValueError if the file is not a readable image.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    # DecompressionBombError (far more pixels than Image.MAX_IMAGE_PIXELS) is neither of the others
+    unreadable = (UnidentifiedImageError, OSError, Image.DecompressionBombError)
+    try:
+        image = Image.open(path)
+    except unreadable as e:
+        raise ValueError(f"Not a valid image: {e}")
+
+    with image:
+        image_format = image.format
+        if image_format == 'GIF' and getattr(image, 'is_animated', False):
+            # Re-encoding would keep only the first frame
+            return image.size
+
+        try:
+            normalized = ImageOps.exif_transpose(image)
+            normalized.thumbnail((max_dimension, max_dimension))
+        except unreadable as e:
+            raise ValueError(f"Not a valid image: {e}")
+
+        # Keep the colour profile and transparency; drop EXIF, XMP, comments and thumbnails
+        icc_profile = image.info.get('icc_profile')
+        transparency = image.info.get('transparency')
+        normalized.info = {}
+        options = dict(SAVE_OPTIONS.get(image_format, {}))
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        if transparency is not None:
+            options['transparency'] = transparency
+        if image_format == 'JPEG':
+            options['quality'] = jpeg_quality
+
+        temp_path = path + '.tmp'
+        normalized.save(temp_path, format=image_format, **options)
+        os.replace(temp_path, path)
+        return normalized.size
+
+
+def image_size(path):
+    """Intrinsic (width, height) of an image file, or (None, None) if unreadable"""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        return None, None
@@ -1,10 +1,34 @@
 from datetime import datetime
+from flask import g
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
 
+
+def read_session():
+    """
+    Session for read-only public pages.
+    Uses the 'read' bind (DATABASE_READ_URL) when configured, otherwise
+    falls back to the primary db.session used by the admin routes.
+    """
+    if 'read' not in db.engines:
+        return db.session
+    
+    if 'read_session' not in g:
+        g.read_session = Session(bind=db.engines['read'], autoflush=False)
+    return g.read_session
+
+
+def close_read_session(exception=None):
+    """Close the per-request read session, if one was opened"""
+    session = g.pop('read_session', None)
+    if session is not None:
+        session.close()
+
+
 class User(UserMixin, db.Model):
     """User model for authentication and profile"""
     id = db.Column(db.Integer, primary_key=True)
@@ -14,6 +38,8 @@ class User(UserMixin, db.Model):
     display_name = db.Column(db.String(100), default='')
     bio_header = db.Column(db.String(200), default='')
     profile_photo_path = db.Column(db.String(200), default='')
+    profile_photo_width = db.Column(db.Integer)
+    profile_photo_height = db.Column(db.Integer)
     bio = db.Column(db.Text, default='')
     linkedin_url = db.Column(db.String(200), default='')
     github_url = db.Column(db.String(200), default='')
@@ -33,6 +59,22 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 
+_dummy_password_hash = None
+
+
+def dummy_password_check(password):
+    """
+    Hash the password against a throwaway hash and return False.
+    Used for unknown usernames so they cost the same as a wrong password
+    and response times don't reveal which usernames exist.
+    """
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = generate_password_hash('not-a-real-password')
+    check_password_hash(_dummy_password_hash, password)
+    return False
+
+
 class Project(db.Model):
     """Project model for portfolio items"""
     id = db.Column(db.Integer, primary_key=True)
@@ -41,6 +83,8 @@ class Project(db.Model):
     content = db.Column(db.Text, nullable=False)  # Markdown content
     github_url = db.Column(db.String(200), default='')
     image_path = db.Column(db.String(200), default='')
+    image_width = db.Column(db.Integer)
+    image_height = db.Column(db.Integer)
     content_images = db.Column(db.Text, default='[]')  # JSON array of content image paths
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -48,3 +92,11 @@ class Project(db.Model):
     
     def __repr__(self):
         return f'<Project {self.title}>'
+
+
+class LoginThrottle(db.Model):
+    """Token-bucket state for login throttling shared by all workers (see app.throttle)"""
+    __tablename__ = 'login_throttle'
+    key = db.Column(db.String(255), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # Unix time of the last refill
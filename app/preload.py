@@ -0,0 +1,122 @@
+"""
+Preload hints for the assets every page needs
+
+Browsers only find the stylesheets, the Font Awesome fonts (referenced from
+inside its CSS) and the header images after parsing the HTML. HTML pages
+therefore get a `Link: <...>; rel=preload` header for each of them:
+
+    all pages   Bootstrap, Font Awesome and site CSS, the solid icon font,
+                the profile photo
+    home page   the first project card image
+    project     the brand icon font (GitHub link)
+
+The list is built from the page's template context and cached per endpoint
+and data version: the profile and first project ids and updated_at. When
+the server offers `wsgi.early_hints` (Gunicorn does), the last list sent
+for the endpoint also goes out as a 103 Early Hints response before the
+view runs. The browser then starts fetching while the page is rendered.
+"""
+import threading
+import time
+from flask import g, request, current_app, template_rendered, url_for
+from app.fragments import fragment_timeout
+from app.storage import upload_url
+
+STYLESHEETS = (
+    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+)
+FONT_AWESOME_WEBFONTS = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/'
+FONTS = ('fa-solid-900.woff2',)
+ENDPOINT_FONTS = {
+    'main.project': ('fa-brands-400.woff2',),
+}
+# Endpoints whose first project card image is above the fold
+PROJECT_IMAGE_ENDPOINTS = {'main.index'}
+CACHE_MAX_ENTRIES = 256
+
+# (endpoint, data version) -> (expires_at, links); endpoint -> (expires_at, links) for early hints
+_links = {}
+_last_links = {}
+_links_lock = threading.Lock()
+
+
+def data_version(context):
+    """What the image hints depend on: the profile and first project rows"""
+    user = context.get('user')
+    projects = context.get('projects') or ()
+    first = projects[0] if projects else None
+    return (
+        getattr(user, 'id', None), getattr(user, 'updated_at', None),
+        getattr(first, 'id', None), getattr(first, 'updated_at', None),
+    )
+
+
+def build_links(endpoint, context):
+    """Link header values for a page rendered by endpoint with this template context"""
+    links = [f'<{href}>; rel=preload; as=style' for href in STYLESHEETS]
+    links.append(f"<{url_for('static', filename='css/style.css')}>; rel=preload; as=style")
+    for font in FONTS + ENDPOINT_FONTS.get(endpoint, ()):
+        links.append(f'<{FONT_AWESOME_WEBFONTS}{font}>; rel=preload; as=font; type="font/woff2"; crossorigin')
+
+    user = context.get('user')
+    if getattr(user, 'profile_photo_path', None):
+        links.append(f'<{upload_url(user.profile_photo_path)}>; rel=preload; as=image')
+    projects = context.get('projects') or ()
+    if endpoint in PROJECT_IMAGE_ENDPOINTS and projects and projects[0].image_path:
+        links.append(f'<{upload_url(projects[0].image_path)}>; rel=preload; as=image')
+    return links
+
+
+def remember_context(sender, template, context, **extra):
+    """Keep the context of the page template (the first one rendered in the request)"""
+    if 'preload_context' not in g:
+        g.preload_context = context
+
+
+def send_early_hints():
+    """Send the endpoint's last preload list as 103 Early Hints, if the server supports it"""
+    early_hints = request.environ.get('wsgi.early_hints')
+    if early_hints is None or request.method != 'GET' or request.endpoint is None:
+        return
+
+    with _links_lock:
+        cached = _last_links.get(request.endpoint)
+    if cached and cached[0] > time.monotonic():
+        early_hints([('Link', link) for link in cached[1]])
+
+
+def add_preload_links(response):
+    """Add the page's preload Link headers to successful HTML responses"""
+    context = g.get('preload_context')
+    if context is None or response.status_code != 200 or response.mimetype != 'text/html':
+        return response
+
+    endpoint = request.endpoint
+    key = (endpoint, data_version(context))
+    now = time.monotonic()
+    with _links_lock:
+        cached = _links.get(key)
+    if cached is None or cached[0] <= now:
+        cached = (now + fragment_timeout(current_app), build_links(endpoint, context))
+        with _links_lock:
+            if len(_links) >= CACHE_MAX_ENTRIES:
+                _links.clear()
+            _links[key] = cached
+    with _links_lock:
+        _last_links[endpoint] = cached
+
+    for link in cached[1]:
+        response.headers.add('Link', link)
+    return response
+
+
+def init_preload(app):
+    """Register the preload hooks (PRELOAD_ENABLED) and 103 Early Hints (EARLY_HINTS)"""
+    if not app.config.get('PRELOAD_ENABLED', True):
+        return
+
+    template_rendered.connect(remember_context, app)
+    app.after_request(add_preload_links)
+    if app.config.get('EARLY_HINTS', True):
+        app.before_request(send_early_hints)
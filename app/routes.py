@@ -1,13 +1,21 @@
 import os
 import json
+import math
 import re
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, abort, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from markupsafe import Markup
+from werkzeug.exceptions import BadRequest
 from werkzeug.utils import secure_filename
-from app.models import db, User, Project
-from app.forms import LoginForm, ProfileForm, ProjectForm
-import markdown2
+from app.models import db, User, Project, read_session, dummy_password_check
+from app.identity import remember_identity, forget_identity
+from app.images import normalize_image
+from app.storage import get_storage, rewrite_upload_urls
+from app.throttle import check_login_attempt
 
 main = Blueprint('main', __name__)
 
@@ -49,14 +57,64 @@ def embed_youtube_videos(text):
     return Markup(result)
 
 
+def render_project_content(content):
+    """Render project Markdown to HTML: bullets -> Markdown -> HTML -> charts -> YouTube embeds"""
+    if not content:
+        return ''
+    
+    # Imported on first render so worker boot and CLI scripts don't pay for it
+    import markdown2
+    
+    converted_content = convert_bullets_to_markdown(content)
+    
+    # [chart ...] shortcodes become placeholders so Markdown leaves them alone
+    charts = []
+    if '[chart' in converted_content:
+        from app.charts import extract_chart_shortcodes
+        converted_content, charts = extract_chart_shortcodes(converted_content)
+    
+    project_html = rewrite_upload_urls(markdown2.markdown(converted_content))
+    if charts:
+        from app.charts import insert_charts
+        project_html = insert_charts(project_html, charts)
+    
+    # Embed YouTube videos in project content
+    return embed_youtube_videos(project_html)
+
+
+# Rendered previews keyed by a hash of the Markdown source (LRU, per worker)
+_preview_cache = OrderedDict()
+_preview_lock = threading.Lock()
+PREVIEW_CACHE_SIZE = 128
+
+
+def render_preview(content):
+    """Render Markdown for the editor preview, reusing earlier renders of identical content"""
+    key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    with _preview_lock:
+        html = _preview_cache.get(key)
+        if html is not None:
+            _preview_cache.move_to_end(key)
+            return key, html
+    
+    html = str(render_project_content(content))
+    
+    with _preview_lock:
+        _preview_cache[key] = html
+        while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    return key, html
+
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
-def save_file(file, folder=''):
-    """Save uploaded file and return path"""
+def save_image(file, folder=''):
+    """Save and normalize an uploaded image; returns (path, width, height) or (None, None, None)"""
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
         # Add timestamp to avoid overwriting
@@ -64,68 +122,243 @@ def save_file(file, folder=''):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
         filename = timestamp + filename
         
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], folder, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        file.save(filepath)
+        # Normalize in a temporary file, then hand the finished image to storage
+        extension = os.path.splitext(filename)[1]
+        fd, temp_path = tempfile.mkstemp(suffix=extension)
+        os.close(fd)
+        file.save(temp_path)
+        
+        # Strip metadata, auto-rotate and cap dimensions before anything serves it
+        try:
+            width, height = normalize_image(
+                temp_path,
+                max_dimension=current_app.config['IMAGE_MAX_DIMENSION'],
+                jpeg_quality=current_app.config['IMAGE_JPEG_QUALITY'],
+            )
+        except ValueError:
+            os.remove(temp_path)
+            return None, None, None
         
-        # Return path with forward slashes for web compatibility
-        web_path = os.path.join('uploads', folder, filename).replace('\\', '/')
-        return web_path
-    return None
+        # Keys use forward slashes, matching the web paths stored in the database
+        web_path = '/'.join(part for part in ('uploads', folder, filename) if part)
+        get_storage().save(web_path, temp_path)
+        return web_path, width, height
+    return None, None, None
+
+
+def save_file(file, folder=''):
+    """Save uploaded file and return path"""
+    return save_image(file, folder)[0]
 
 
 # Public routes
 @main.route('/')
 def index():
     """Landing page with projects"""
-    user = User.query.first()
-    projects = Project.query.filter_by(published=True).order_by(Project.created_at.desc()).all()
+    reader = read_session()
+    user = reader.query(User).first()
+    projects = reader.query(Project).filter_by(published=True).order_by(Project.created_at.desc()).all()
     return render_template('index.html', user=user, projects=projects)
 
 
 @main.route('/about')
 def about():
     """About/Resume page"""
-    user = User.query.first()
+    user = read_session().query(User).first()
     # Process about_text to embed YouTube videos
-    about_html = embed_youtube_videos(user.about_text) if user and user.about_text else ''
+    about_html = embed_youtube_videos(rewrite_upload_urls(user.about_text)) if user and user.about_text else ''
     return render_template('about.html', user=user, about_html=about_html)
 
 
 @main.route('/project/<int:id>')
 def project(id):
     """Individual project page"""
-    user = User.query.first()
-    project = Project.query.get_or_404(id)
-    
-    # Convert various bullet formats to markdown, then convert to HTML
-    if project.content:
-        converted_content = convert_bullets_to_markdown(project.content)
-        project_html = markdown2.markdown(converted_content)
-        # Embed YouTube videos in project content
-        project_html = embed_youtube_videos(project_html)
-    else:
-        project_html = ''
+    reader = read_session()
+    user = reader.query(User).first()
+    project = reader.get(Project, id) or abort(404)
+    project_html = render_project_content(project.content)
     
     return render_template('project.html', user=user, project=project, project_html=project_html)
 
 
+def titanic_query():
+    """Explorer parameters from the query string, with defaults and validation"""
+    from app.titanic import DATASETS, DIMENSIONS
+    
+    dataset = request.args.get('dataset', 'train')
+    if dataset not in DATASETS:
+        abort(404)
+    
+    filters = {name: request.args.getlist(name) for name in ('pclass', 'sex', 'embarked', 'survived')}
+    for name in ('age_min', 'age_max', 'fare_min', 'fare_max'):
+        # An empty form field means no bound
+        value = request.args.get(name, '').strip()
+        if not value:
+            filters[name] = None
+            continue
+        try:
+            number = float(value)
+        except ValueError:
+            abort(400, description=f'{name} must be a number')
+        # NaN/inf would match nothing and can't be written as JSON
+        if not math.isfinite(number):
+            abort(400, description=f'{name} must be a finite number')
+        filters[name] = number
+    
+    group_dimensions = [name for name in request.args.getlist('group') if name in DIMENSIONS][:3]
+    if not group_dimensions:
+        group_dimensions = ['pclass', 'sex']
+    crosstab_column = request.args.get('column', 'survived')
+    if crosstab_column not in DIMENSIONS:
+        crosstab_column = 'survived'
+    
+    return dataset, filters, group_dimensions, crosstab_column
+
+
+@main.route('/data/titanic')
+def titanic_explorer():
+    """Interactive explorer for the Titanic CSVs in data/"""
+    # NumPy is only imported once someone opens the explorer
+    from app import titanic
+    from app.charts import explorer_charts
+    
+    dataset, filters, group_dimensions, crosstab_column = titanic_query()
+    result = titanic.explore(dataset, filters, group_dimensions, crosstab_column)
+    charts = explorer_charts(dataset, filters, group_dimensions)
+    user = read_session().query(User).first()
+    return render_template('titanic.html', user=user, result=result, charts=charts,
+                           datasets=titanic.DATASETS, dimensions=titanic.DIMENSIONS,
+                           options=titanic.filter_options(dataset),
+                           group_dimensions=group_dimensions, crosstab_column=crosstab_column)
+
+
+@main.route('/data/titanic.json')
+def titanic_explorer_json():
+    """Explorer results as JSON, same query parameters as the page"""
+    from app import titanic
+    
+    try:
+        query = titanic_query()
+    except BadRequest as e:
+        return jsonify(error=e.description), 400
+    return jsonify(titanic.explore(*query))
+
+
+def score_uploaded_submission():
+    """Score the uploaded submission file; returns (score, error)"""
+    from app import titanic
+    
+    upload = request.files.get('submission')
+    if not upload or not upload.filename:
+        return None, 'Choose a CSV file with PassengerId and Survived columns.'
+    try:
+        # Parsed straight from the upload stream, never read into one string
+        return titanic.score_submission(*titanic.read_submission(upload.stream)), None
+    except titanic.SubmissionError as e:
+        return None, str(e)
+
+
+@main.route('/data/titanic/score', methods=['GET', 'POST'])
+def titanic_score():
+    """Score a Kaggle-style Titanic submission against the true test outcomes"""
+    from app import titanic
+    
+    score, error = None, None
+    if request.method == 'POST':
+        score, error = score_uploaded_submission()
+    
+    upload = request.files.get('submission')
+    user = read_session().query(User).first()
+    return render_template('titanic_score.html', user=user, score=score, error=error,
+                           filename=upload.filename if upload else None,
+                           baseline=titanic.score_baseline())
+
+
+@main.route('/data/titanic/score.json', methods=['POST'])
+def titanic_score_json():
+    """Submission score as JSON"""
+    score, error = score_uploaded_submission()
+    if error:
+        return jsonify(error=error), 400
+    return jsonify(score)
+
+
+@main.route('/data/titanic/predict', methods=['POST'])
+def titanic_predict():
+    """Survival probabilities for a batch of passengers, scored in one vectorized pass"""
+    from app.titanic_model import PredictionError, get_model, records_to_columns
+    
+    model = get_model()
+    if model is None:
+        return jsonify(error='No model has been trained yet (run python scripts/train_model.py)'), 503
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(error='Body must be a JSON object with a passengers list'), 400
+    
+    records = data.get('passengers')
+    try:
+        columns = records_to_columns(records)
+    except PredictionError as e:
+        return jsonify(error=str(e)), 400
+    
+    probabilities = model.predict_proba(columns)
+    ids = [passenger.get('PassengerId') for passenger in records]
+    return jsonify(
+        predictions=[
+            {'PassengerId': passenger_id, 'probability': round(probability, 4), 'survived': int(probability >= 0.5)}
+            for passenger_id, probability in zip(ids, probabilities.tolist())
+        ],
+        model=model.meta,
+    )
+
+
+@main.route('/sitemap.xml')
+def sitemap():
+    """Sitemap of the public pages, re-rendered only when projects change"""
+    from app.feeds import xml_response
+    
+    return xml_response('sitemap', 'application/xml')
+
+
+@main.route('/feed.atom')
+def feed():
+    """Atom feed of published projects"""
+    from app.feeds import xml_response
+    
+    return xml_response('feed', 'application/atom+xml')
+
+
 # Authentication
 @main.route('/login', methods=['GET', 'POST'])
 def login():
     """Login page"""
+    from app.forms import LoginForm
+    
     if current_user.is_authenticated:
         return redirect(url_for('main.admin_dashboard'))
     
     user = User.query.first()
     form = LoginForm()
     if form.validate_on_submit():
+        # Rejected before the (deliberately slow) password hash is computed
+        retry_after = check_login_attempt(form.username.data)
+        if retry_after:
+            flash('Too many login attempts. Please wait a minute and try again.', 'danger')
+            response = current_app.make_response((render_template('login.html', user=user, form=form), 429))
+            response.headers['Retry-After'] = str(max(1, int(retry_after + 0.5)))
+            return response
+        
         user_account = User.query.filter_by(username=form.username.data).first()
+        # Unknown usernames cost one hash too, so timing doesn't reveal which exist
         if user_account and user_account.check_password(form.password.data):
             login_user(user_account)
+            remember_identity(user_account)
             next_page = request.args.get('next')
             return redirect(next_page) if next_page else redirect(url_for('main.admin_dashboard'))
         else:
+            if user_account is None:
+                dummy_password_check(form.password.data)
             flash('Invalid username or password', 'danger')
     
     return render_template('login.html', user=user, form=form)
@@ -136,6 +369,7 @@ def login():
 def logout():
     """Logout"""
     logout_user()
+    forget_identity()
     return redirect(url_for('main.index'))
 
 
@@ -153,6 +387,8 @@ def admin_dashboard():
 @login_required
 def edit_profile():
     """Edit profile information"""
+    from app.forms import ProfileForm
+    
     user = User.query.first()
     form = ProfileForm()
     
@@ -167,11 +403,15 @@ def edit_profile():
         
         # Handle profile photo upload
         if form.profile_photo.data and hasattr(form.profile_photo.data, 'filename') and form.profile_photo.data.filename:
-            photo_path = save_file(form.profile_photo.data, 'profile')
+            photo_path, width, height = save_image(form.profile_photo.data, 'profile')
             if photo_path:
                 current_user.profile_photo_path = photo_path
+                current_user.profile_photo_width = width
+                current_user.profile_photo_height = height
         
         db.session.commit()
+        # Other workers see the new version in the cookie and reload the user
+        remember_identity(current_user)
         return redirect(url_for('main.edit_profile'))
     
     # Pre-populate form
@@ -190,6 +430,8 @@ def edit_profile():
 @login_required
 def new_project():
     """Create new project"""
+    from app.forms import ProjectForm
+    
     user = User.query.first()
     form = ProjectForm()
     
@@ -204,9 +446,11 @@ def new_project():
         
         # Handle image upload
         if form.image.data and hasattr(form.image.data, 'filename') and form.image.data.filename:
-            image_path = save_file(form.image.data, 'projects')
+            image_path, width, height = save_image(form.image.data, 'projects')
             if image_path:
                 project.image_path = image_path
+                project.image_width = width
+                project.image_height = height
         
         # Handle content images upload
         content_image_paths = []
@@ -233,6 +477,8 @@ def new_project():
 @login_required
 def edit_project(id):
     """Edit existing project"""
+    from app.forms import ProjectForm
+    
     user = User.query.first()
     project = Project.query.get_or_404(id)
     form = ProjectForm()
@@ -246,9 +492,11 @@ def edit_project(id):
         
         # Handle image upload
         if form.image.data and hasattr(form.image.data, 'filename') and form.image.data.filename:
-            image_path = save_file(form.image.data, 'projects')
+            image_path, width, height = save_image(form.image.data, 'projects')
             if image_path:
                 project.image_path = image_path
+                project.image_width = width
+                project.image_height = height
         
         # Handle content images upload
         if form.content_images.data:
@@ -283,6 +531,19 @@ def edit_project(id):
     return render_template('admin/project_form.html', user=user, form=form, title='Edit Project', project=project)
 
 
+@main.route('/admin/project/preview', methods=['POST'])
+@login_required
+def preview_project():
+    """Render draft Markdown for the editor's live preview without saving"""
+    data = request.get_json(silent=True)
+    content = data.get('content') if isinstance(data, dict) else None
+    if not isinstance(content, str):
+        return jsonify(error='content must be a string'), 400
+    
+    content_hash, html = render_preview(content)
+    return jsonify(html=html, hash=content_hash)
+
+
 @main.route('/admin/project/<int:id>/delete', methods=['POST'])
 @login_required
 def delete_project(id):
@@ -309,11 +570,9 @@ def delete_content_image(project_id, image_path):
             project.content_images = json.dumps(existing_images)
             db.session.commit()
             
-            # Delete the physical file
+            # Delete the stored file
             try:
-                file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], '..', 'static', image_path)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                get_storage().delete(image_path)
             except Exception as e:
                 print(f"Could not delete file: {e}")
             
@@ -330,7 +589,7 @@ def delete_content_image(project_id, image_path):
 @main.app_errorhandler(404)
 def not_found_error(error):
     """404 error handler"""
-    user = User.query.first()
+    user = read_session().query(User).first()
     return render_template('404.html', user=user), 404
 
 
@@ -338,5 +597,8 @@ def not_found_error(error):
 def internal_error(error):
     """500 error handler"""
     db.session.rollback()
-    user = User.query.first()
+    reader = read_session()
+    if reader is not db.session:
+        reader.rollback()
+    user = reader.query(User).first()
     return render_template('404.html', user=user), 500
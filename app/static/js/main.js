@@ -14,6 +14,48 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Live Markdown preview in the project editor (debounced, no saving)
+    const preview = document.getElementById('contentPreview');
+    if (preview) {
+        const source = document.getElementById(preview.dataset.previewSource);
+        let timer = null;
+        let lastContent = null;
+
+        const refreshPreview = () => {
+            const content = source.value;
+            if (content === lastContent) {
+                return;
+            }
+            lastContent = content;
+            preview.classList.add('is-loading');
+
+            fetch(preview.dataset.previewUrl, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                credentials: 'same-origin',
+                body: JSON.stringify({content: content})
+            })
+                .then(response => response.json())
+                .then(data => {
+                    // Ignore responses for content that has since changed
+                    if (content === source.value && data.html !== undefined) {
+                        preview.innerHTML = data.html;
+                    }
+                })
+                .catch(() => {})
+                .finally(() => preview.classList.remove('is-loading'));
+        };
+
+        source.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(refreshPreview, 400);
+        });
+
+        if (source.value) {
+            refreshPreview();
+        }
+    }
+
     // Auto-hide alerts after 5 seconds
     const alerts = document.querySelectorAll('.alert');
     alerts.forEach(alert => {
@@ -0,0 +1,214 @@
+"""
+Storage backends for uploaded files
+
+Upload paths are stored in the database as keys like
+'uploads/projects/20250101_120000_photo.jpg'. A backend turns a key into
+bytes somewhere and into a URL for the browser:
+
+    LocalStorage  files under UPLOAD_FOLDER, served from /static/uploads/
+    S3Storage     objects in an S3-compatible bucket (AWS S3, MinIO, ...),
+                  linked directly (public URL) or via presigned URLs, so
+                  image bytes never pass through the app's workers
+
+Select one with STORAGE_BACKEND=local|s3 (see config.py).
+
+Local uploads are served by serve_upload(), which can hand the file to a
+front proxy (UPLOAD_SENDFILE=x-sendfile|x-accel-redirect) so gunicorn
+workers only send headers, never image bytes.
+"""
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import time
+from urllib.parse import quote
+from flask import abort, current_app, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+from markupsafe import escape
+
+KEY_PREFIX = 'uploads/'
+
+# Upload links written into Markdown by the editor, e.g. ![x](/static/uploads/projects/a.png)
+STATIC_UPLOAD_PATTERN = re.compile(r'/static/(uploads/[^\s)"\'<>]+)')
+
+
+class LocalStorage:
+    """Uploads on the local filesystem, served by Flask's static route"""
+
+    name = 'local'
+
+    def __init__(self, upload_folder):
+        self.upload_folder = upload_folder
+
+    def path(self, key):
+        """Filesystem path for a key"""
+        relative = key[len(KEY_PREFIX):] if key.startswith(KEY_PREFIX) else key
+        return os.path.join(self.upload_folder, *relative.split('/'))
+
+    def save(self, key, local_path):
+        """Move a finished local file into storage under key"""
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(local_path, target)
+
+    def delete(self, key):
+        """Delete a stored file; missing files are ignored"""
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def url(self, key):
+        return url_for('static', filename=key)
+
+    # URLs never expire
+    url_lifetime = None
+
+    def iter_files(self):
+        """Yield (key, size, mtime) for every stored file"""
+        for root, dirs, files in os.walk(self.upload_folder):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                key = KEY_PREFIX + os.path.relpath(path, self.upload_folder).replace('\\', '/')
+                yield key, stat.st_size, stat.st_mtime
+
+
+class S3Storage:
+    """Uploads in an S3-compatible bucket"""
+
+    name = 's3'
+
+    def __init__(self, bucket, endpoint_url=None, region=None, public_url=None, presign_expires=3600):
+        import boto3
+
+        self.bucket = bucket
+        self.public_url = public_url.rstrip('/') if public_url else None
+        self.presign_expires = presign_expires
+        self.client = boto3.client('s3', endpoint_url=endpoint_url or None, region_name=region or None)
+        # Presigned URLs are reused until half their lifetime has passed
+        self._presigned = {}
+        self._lock = threading.Lock()
+
+    def save(self, key, local_path):
+        """Upload a finished local file under key and remove the local copy"""
+        content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+        self.client.upload_file(local_path, self.bucket, key, ExtraArgs={
+            'ContentType': content_type,
+            # Keys are timestamped and never rewritten, so browsers may cache forever
+            'CacheControl': 'public, max-age=31536000, immutable',
+        })
+        os.remove(local_path)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        with self._lock:
+            self._presigned.pop(key, None)
+
+    @property
+    def url_lifetime(self):
+        """Seconds a URL from url() is still valid at the least (None if it never expires)"""
+        return None if self.public_url else self.presign_expires / 2
+
+    def url(self, key):
+        if self.public_url:
+            return f'{self.public_url}/{key}'
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._presigned.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        signed = self.client.generate_presigned_url(
+            'get_object', Params={'Bucket': self.bucket, 'Key': key}, ExpiresIn=self.presign_expires,
+        )
+        with self._lock:
+            self._presigned[key] = (signed, now + self.presign_expires / 2)
+        return signed
+
+    def iter_files(self):
+        """Yield (key, size, mtime) for every stored object"""
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=KEY_PREFIX):
+            for item in page.get('Contents', []):
+                yield item['Key'], item['Size'], item['LastModified'].timestamp()
+
+
+def init_storage(app):
+    """Create the configured storage backend and expose upload_url() to templates"""
+    backend = app.config.get('STORAGE_BACKEND', 'local')
+    if backend == 's3':
+        storage = S3Storage(
+            bucket=app.config['S3_BUCKET'],
+            endpoint_url=app.config.get('S3_ENDPOINT_URL'),
+            region=app.config.get('S3_REGION'),
+            public_url=app.config.get('S3_PUBLIC_URL'),
+            presign_expires=app.config.get('S3_PRESIGN_EXPIRES', 3600),
+        )
+    elif backend == 'local':
+        storage = LocalStorage(app.config['UPLOAD_FOLDER'])
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+    app.extensions['storage'] = storage
+    app.add_template_global(upload_url)
+    
+    if storage.name == 'local':
+        # More specific than Flask's /static/<path:filename>, so it wins for uploads
+        app.add_url_rule('/static/uploads/<path:filename>', 'upload_file', serve_upload)
+    return storage
+
+
+def serve_upload(filename):
+    """Serve a local upload, optionally through the front proxy's sendfile support"""
+    storage = get_storage()
+    path = safe_join(os.path.abspath(storage.upload_folder), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    
+    mode = current_app.config.get('UPLOAD_SENDFILE')
+    max_age = current_app.config.get('UPLOAD_CACHE_MAX_AGE', 31536000)
+    
+    if mode == 'x-accel-redirect':
+        # nginx serves the internal location; Content-Type and Cache-Control pass through
+        response = current_app.response_class()
+        prefix = current_app.config.get('UPLOAD_ACCEL_PREFIX', '/protected-uploads/')
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(filename)
+    elif mode == 'x-sendfile':
+        # Apache mod_xsendfile / lighttpd read the file named in the header
+        response = current_app.response_class()
+        response.headers['X-Sendfile'] = path
+    else:
+        response = send_from_directory(os.path.abspath(storage.upload_folder), filename, max_age=max_age)
+        response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+        return response
+    
+    response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    # Upload names are timestamped and never rewritten, so they can be cached for good
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    stat = os.stat(path)
+    response.last_modified = stat.st_mtime
+    response.set_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    return response.make_conditional(request)
+
+
+def get_storage():
+    """The storage backend of the current app"""
+    return current_app.extensions['storage']
+
+
+def upload_url(key):
+    """Browser URL for an uploaded file"""
+    if not key:
+        return ''
+    return get_storage().url(key)
+
+
+def rewrite_upload_urls(html):
+    """Point /static/uploads/... links in rendered content at the storage backend"""
+    storage = get_storage()
+    if not html or storage.name == 'local':
+        return html
+    return STATIC_UPLOAD_PATTERN.sub(lambda match: str(escape(storage.url(match.group(1)))), html)
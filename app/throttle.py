@@ -0,0 +1,166 @@
+"""
+Login throttling with token buckets
+
+Checking a password costs a deliberately slow hash, so a burst of bogus
+logins can use up the workers' CPU. Each login attempt takes a token from a
+bucket for the client IP and one for the submitted username. A bucket holds
+up to `capacity` tokens and gets one back every `refill_seconds`. When a
+bucket is empty, the attempt is rejected before any database lookup or
+hashing happens.
+
+Buckets live in one of two backends:
+    memory    per-worker dict; fine for a single process
+    database  the login_throttle table, updated with one atomic statement,
+              so every worker (and instance) shares the same limits
+"""
+import hashlib
+import threading
+import time
+from flask import request, current_app
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, LoginThrottle
+
+
+class MemoryBackend:
+    """Token buckets in a per-worker dict, pruned once it grows past max_keys"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_seconds, now):
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) / refill_seconds)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) * refill_seconds
+
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0
+
+    def _prune(self, now):
+        # Oldest buckets first; they are the closest to full (or already full)
+        stale = sorted(self._buckets, key=lambda key: self._buckets[key][1])
+        for key in stale[:len(stale) - self.max_keys // 2]:
+            del self._buckets[key]
+
+
+class DatabaseBackend:
+    """Token buckets in the login_throttle table, shared by all workers"""
+
+    PRUNE_EVERY = 100  # inserts between deletes of refilled buckets
+
+    def __init__(self):
+        self._inserts = 0
+
+    def take(self, key, capacity, refill_seconds, now):
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        table = LoginThrottle.__table__
+        refilled = table.c.tokens + (now - table.c.updated_at) / refill_seconds
+        refilled = case((refilled > capacity, capacity), else_=refilled)
+
+        with db.engine.begin() as connection:
+            # Refill and take in one statement, so concurrent workers can't both take the last token
+            taken = connection.execute(
+                update(table)
+                .where(table.c.key == key, refilled >= 1)
+                .values(tokens=refilled - 1, updated_at=now)
+            ).rowcount
+            if taken:
+                return 0
+
+            row = connection.execute(select(table.c.tokens, table.c.updated_at).where(table.c.key == key)).first()
+            if row is not None:
+                tokens = min(capacity, row.tokens + (now - row.updated_at) / refill_seconds)
+                return (1 - tokens) * refill_seconds
+
+        # First attempt for this key; a concurrent insert of the same key just means retrying the update
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(table).values(key=key, tokens=capacity - 1, updated_at=now))
+        except IntegrityError:
+            return self.take(key, capacity, refill_seconds, now)
+
+        self._inserts += 1
+        if self._inserts % self.PRUNE_EVERY == 0:
+            self.prune(now, capacity * refill_seconds)
+        return 0
+
+    def prune(self, now, full_after):
+        """Delete buckets idle long enough to be full again (same as having no row)"""
+        table = LoginThrottle.__table__
+        with db.engine.begin() as connection:
+            connection.execute(delete(table).where(table.c.updated_at < now - full_after))
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'database': DatabaseBackend,
+}
+
+
+class Throttle:
+    """Per-IP and per-username buckets checked before a login is attempted"""
+
+    def __init__(self, backend, rules):
+        self.backend = backend
+        self.rules = rules  # scope -> (capacity, refill_seconds)
+
+    def check(self, **values):
+        """
+        Take a token from each scope's bucket, e.g. check(ip=..., username=...).
+        Returns 0 if the attempt may go ahead, else the seconds to wait.
+        """
+        now = time.time()
+        for scope, value in values.items():
+            capacity, refill_seconds = self.rules[scope]
+            # Hash the value so any username fits the key column
+            digest = hashlib.sha256(value.encode('utf-8')).hexdigest()[:32]
+            retry_after = self.backend.take(f'{scope}:{digest}', capacity, refill_seconds, now)
+            if retry_after:
+                return retry_after
+        return 0
+
+
+def client_ip():
+    """
+    Address of the client making the request.
+    Behind LOGIN_THROTTLE_PROXY_COUNT trusted proxies, it is taken from
+    X-Forwarded-For; otherwise every request would share the proxy's address.
+    """
+    proxies = current_app.config.get('LOGIN_THROTTLE_PROXY_COUNT', 0)
+    if proxies:
+        forwarded = [part.strip() for part in request.headers.get('X-Forwarded-For', '').split(',') if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.remote_addr or 'unknown'
+
+
+def check_login_attempt(username):
+    """Seconds the client must wait before trying to log in, or 0 if it may go ahead"""
+    throttle = current_app.extensions.get('login_throttle')
+    if throttle is None:
+        return 0
+    return throttle.check(ip=client_ip(), username=(username or '').strip().lower())
+
+
+def init_throttle(app):
+    """Create the login throttle selected by LOGIN_THROTTLE_BACKEND ('' or 'off' disables it)"""
+    name = (app.config.get('LOGIN_THROTTLE_BACKEND') or 'off').lower()
+    if name == 'off':
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LOGIN_THROTTLE_BACKEND {name!r}; use one of: {', '.join(BACKENDS)}")
+
+    throttle = Throttle(BACKENDS[name](), {
+        'ip': app.config['LOGIN_THROTTLE_IP'],
+        'username': app.config['LOGIN_THROTTLE_USERNAME'],
+    })
+    app.extensions['login_throttle'] = throttle
+    return throttle
@@ -0,0 +1,409 @@
+"""
+Titanic dataset explorer
+
+The CSVs in data/ are parsed once per worker into typed NumPy columns:
+numbers as int64/float64 arrays (NaN marks a missing Age or Fare),
+Sex and Embarked as small integer codes plus their labels, and free text
+(Name, Ticket, Cabin) as object arrays. Tables are reloaded only when the
+file changes. When scripts/convert_data.py has written an up-to-date
+binary copy (see app.columnar), the columns are memory-mapped from it
+instead of parsing the CSV.
+
+Filters are boolean masks; group-bys and crosstabs combine the grouping
+codes into one index and count with np.bincount, so no query loops over
+passengers in Python.
+
+Kaggle-style submissions (PassengerId,Survived) are scored against
+test_true.csv the same way: np.loadtxt parses the upload in chunks straight
+from the request stream, np.searchsorted joins it on PassengerId, and the
+metrics are bincounts over the matched rows.
+"""
+import csv
+import io
+import os
+import threading
+import warnings
+import numpy as np
+from app import columnar
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+COLUMNAR_DIR = os.path.join(DATA_DIR, 'columnar')
+
+# Labelled datasets the explorer can show (test.csv has no Survived column)
+DATASETS = {
+    'train': ('train.csv', 'Training set (891 passengers)'),
+    'test_true': ('test_true.csv', 'Test set with true outcomes (418 passengers)'),
+}
+
+COLUMN_TYPES = {
+    'PassengerId': 'int',
+    'Survived': 'int',
+    'Pclass': 'int',
+    'Name': 'text',
+    'Sex': 'category',
+    'Age': 'float',
+    'SibSp': 'int',
+    'Parch': 'int',
+    'Ticket': 'text',
+    'Fare': 'float',
+    'Cabin': 'text',
+    'Embarked': 'category',
+}
+
+# Ground truth for submissions and the segments their accuracy is broken down by
+SCORING_DATASET = 'test_true'
+SCORING_SEGMENTS = ('pclass', 'sex', 'embarked')
+SUBMISSION_MAX_ROWS = 100000
+PASSENGER_ID_MAX = 10 ** 9
+BASELINE_SUBMISSION = 'gender_submission.csv'
+
+EMBARKED_NAMES = {'C': 'Cherbourg', 'Q': 'Queenstown', 'S': 'Southampton', '': 'Unknown'}
+AGE_BIN_EDGES = [10, 20, 30, 40, 50, 60]
+FARE_QUANTILES = [0.25, 0.5, 0.75]
+
+DIMENSIONS = {
+    'pclass': 'Class',
+    'sex': 'Sex',
+    'embarked': 'Embarked',
+    'age': 'Age band',
+    'fare': 'Fare quartile',
+    'survived': 'Outcome',
+}
+
+
+class Table:
+    """Typed columns of one dataset"""
+
+    def __init__(self, columns, categories):
+        self.columns = columns
+        # Labels of category columns; codes index into these lists
+        self.categories = categories
+        self.rows = len(next(iter(columns.values())))
+        self._dimensions = {}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def dimension(self, name):
+        """(codes, labels) for a grouping dimension, computed once per table"""
+        if name not in self._dimensions:
+            self._dimensions[name] = _build_dimension(self, name)
+        return self._dimensions[name]
+
+
+def parse_column(values, kind):
+    """Convert a column of CSV strings to a typed array (and labels for categories)"""
+    raw = np.array(values, dtype=str)
+    if kind == 'int':
+        return raw.astype(np.int64), None
+    if kind == 'float':
+        return np.where(raw == '', 'nan', raw).astype(np.float64), None
+    if kind == 'category':
+        labels, codes = np.unique(raw, return_inverse=True)
+        return codes.astype(np.int8), labels.tolist()
+    return raw.astype(object), None
+
+
+def load_csv(path):
+    """Parse a Titanic CSV into a Table; unnamed columns (a pandas index) are skipped"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+
+    columns = {}
+    categories = {}
+    for index, values in enumerate(zip(*rows)):
+        name = header[index]
+        if not name:
+            continue
+        column, labels = parse_column(values, COLUMN_TYPES.get(name, 'text'))
+        columns[name] = column
+        if labels is not None:
+            categories[name] = labels
+    return Table(columns, categories)
+
+
+def load_table(csv_path):
+    """Table for a CSV: its memory-mapped columnar copy if current, otherwise the parsed CSV"""
+    out_dir = os.path.join(COLUMNAR_DIR, os.path.splitext(os.path.basename(csv_path))[0])
+    meta = columnar.read_meta(out_dir, csv_path)
+    if meta:
+        return Table(*columnar.load_columns(out_dir, meta))
+    return load_csv(csv_path)
+
+
+# Parsed tables per worker: name -> (mtime, Table)
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def dataset_path(name):
+    return os.path.join(DATA_DIR, DATASETS[name][0])
+
+
+def dataset_mtime(name):
+    """Modification time of a dataset's CSV; cached results built from it are keyed by this"""
+    return os.path.getmtime(dataset_path(name))
+
+
+def get_table(name):
+    """Cached Table for a dataset, re-parsed when its CSV changes"""
+    path = dataset_path(name)
+    mtime = os.path.getmtime(path)
+
+    with _tables_lock:
+        cached = _tables.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    table = load_table(path)
+    with _tables_lock:
+        _tables[name] = (mtime, table)
+    return table
+
+
+def _build_dimension(table, name):
+    if name == 'pclass':
+        return table['Pclass'] - 1, ['1st', '2nd', '3rd']
+    if name == 'survived':
+        return table['Survived'], ['Died', 'Survived']
+    if name == 'sex':
+        return table['Sex'], [label.title() for label in table.categories['Sex']]
+    if name == 'embarked':
+        return table['Embarked'], [EMBARKED_NAMES.get(label, label) for label in table.categories['Embarked']]
+    if name == 'age':
+        age = table['Age']
+        codes = np.digitize(age, AGE_BIN_EDGES)
+        # NaN sorts past every edge; give unknown ages their own group
+        codes[np.isnan(age)] = len(AGE_BIN_EDGES) + 1
+        bounds = [0] + AGE_BIN_EDGES
+        labels = [f'{low}–{high - 1}' for low, high in zip(bounds, AGE_BIN_EDGES)]
+        return codes, labels + [f'{AGE_BIN_EDGES[-1]}+', 'Unknown']
+    if name == 'fare':
+        fare = table['Fare']
+        edges = np.nanquantile(fare, FARE_QUANTILES)
+        codes = np.searchsorted(edges, fare, side='left')
+        codes[np.isnan(fare)] = len(edges) + 1
+        bounds = [np.nanmin(fare)] + edges.tolist() + [np.nanmax(fare)]
+        labels = [f'Q{i + 1} (£{bounds[i]:.2f}–{bounds[i + 1]:.2f})' for i in range(len(edges) + 1)]
+        return codes, labels + ['Unknown']
+    raise KeyError(name)
+
+
+def build_mask(table, filters):
+    """Boolean row mask for the explorer filters; unset filters match everything"""
+    mask = np.ones(table.rows, dtype=bool)
+
+    for name in ('pclass', 'sex', 'embarked', 'survived'):
+        selected = filters.get(name)
+        if selected:
+            codes, labels = table.dimension(name)
+            wanted = [labels.index(label) for label in selected if label in labels]
+            mask &= np.isin(codes, wanted)
+
+    for name, column in (('age', 'Age'), ('fare', 'Fare')):
+        low = filters.get(f'{name}_min')
+        high = filters.get(f'{name}_max')
+        # Comparisons with NaN are False, so a range excludes unknown values
+        if low is not None:
+            mask &= table[column] >= low
+        if high is not None:
+            mask &= table[column] <= high
+
+    return mask
+
+
+def summarize(table, mask):
+    """Headline numbers for the selected passengers"""
+    count = int(mask.sum())
+    survivors = int(table['Survived'][mask].sum())
+    ages = table['Age'][mask]
+    fares = table['Fare'][mask]
+    return {
+        'passengers': count,
+        'survivors': survivors,
+        'survival_rate': survivors / count if count else None,
+        'mean_age': float(np.nanmean(ages)) if np.isfinite(ages).any() else None,
+        'median_fare': float(np.nanmedian(fares)) if np.isfinite(fares).any() else None,
+    }
+
+
+def _combined_codes(table, dimensions):
+    """One integer per row identifying its group across all dimensions"""
+    codes = [table.dimension(name)[0] for name in dimensions]
+    sizes = [len(table.dimension(name)[1]) for name in dimensions]
+    return np.ravel_multi_index(codes, sizes), sizes
+
+
+def group_by(table, mask, dimensions):
+    """Passenger count, survivors and survival rate for every non-empty group"""
+    combined, sizes = _combined_codes(table, dimensions)
+    selected = combined[mask]
+    counts = np.bincount(selected, minlength=int(np.prod(sizes)))
+    survivors = np.bincount(selected, weights=table['Survived'][mask], minlength=counts.size)
+
+    labels = [table.dimension(name)[1] for name in dimensions]
+    groups = []
+    for flat in np.flatnonzero(counts):
+        position = np.unravel_index(flat, sizes)
+        groups.append({
+            'group': [labels[i][code] for i, code in enumerate(position)],
+            'passengers': int(counts[flat]),
+            'survivors': int(survivors[flat]),
+            'survival_rate': float(survivors[flat] / counts[flat]),
+        })
+    return groups
+
+
+def crosstab(table, mask, rows, column):
+    """Count matrix with one row per combination of rows dimensions and one column per value of column"""
+    combined, sizes = _combined_codes(table, list(rows) + [column])
+    counts = np.bincount(combined[mask], minlength=int(np.prod(sizes))).reshape(-1, sizes[-1])
+
+    row_labels = [table.dimension(name)[1] for name in rows]
+    row_sizes = sizes[:-1]
+    result = []
+    for flat in np.flatnonzero(counts.sum(axis=1)):
+        position = np.unravel_index(flat, row_sizes)
+        result.append({
+            'group': [row_labels[i][code] for i, code in enumerate(position)],
+            'counts': counts[flat].tolist(),
+            'total': int(counts[flat].sum()),
+        })
+    return {
+        'rows': [DIMENSIONS[name] for name in rows],
+        'columns': table.dimension(column)[1],
+        'data': result,
+        'totals': counts.sum(axis=0).tolist(),
+    }
+
+
+def explore(dataset, filters, group_dimensions, crosstab_column):
+    """Everything the explorer page shows, as plain data (also served as JSON)"""
+    table = get_table(dataset)
+    mask = build_mask(table, filters)
+    return {
+        'dataset': dataset,
+        'filters': filters,
+        'summary': summarize(table, mask),
+        'group_by': [DIMENSIONS[name] for name in group_dimensions],
+        'groups': group_by(table, mask, group_dimensions),
+        'crosstab': crosstab(table, mask, group_dimensions, crosstab_column),
+    }
+
+
+def filter_options(dataset):
+    """Labels offered by the filter checkboxes"""
+    table = get_table(dataset)
+    return {name: table.dimension(name)[1] for name in ('pclass', 'sex', 'embarked', 'survived')}
+
+
+class SubmissionError(ValueError):
+    """A submission file that cannot be scored"""
+
+
+def read_submission(stream):
+    """Parse a PassengerId,Survived CSV from a binary stream into (ids, predictions) arrays"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        try:
+            header = [name.strip().strip('"') for name in text.readline().split(',')]
+        except UnicodeDecodeError:
+            raise SubmissionError('File must be UTF-8 CSV')
+        try:
+            columns = (header.index('PassengerId'), header.index('Survived'))
+        except ValueError:
+            raise SubmissionError('The header must contain PassengerId and Survived columns')
+
+        try:
+            with warnings.catch_warnings():
+                # An empty body is reported below, not as a warning
+                warnings.simplefilter('ignore', UserWarning)
+                values = np.loadtxt(text, delimiter=',', usecols=columns, dtype=np.float64,
+                                    ndmin=2, quotechar='"', max_rows=SUBMISSION_MAX_ROWS + 1)
+        except UnicodeDecodeError:
+            raise SubmissionError('File must be UTF-8 CSV')
+        except ValueError as e:
+            raise SubmissionError(f'Could not parse the file: {e}')
+    finally:
+        # Leave the underlying upload stream open for Werkzeug to clean up
+        text.detach()
+
+    if len(values) == 0:
+        raise SubmissionError('The file contains no predictions')
+    if len(values) > SUBMISSION_MAX_ROWS:
+        raise SubmissionError(f'At most {SUBMISSION_MAX_ROWS} rows are accepted')
+
+    ids, predictions = values[:, 0], values[:, 1]
+    # Checked before the int64 cast, which turns inf or huge values into garbage ids
+    if not np.isfinite(ids).all() or not np.array_equal(ids, np.round(ids)):
+        raise SubmissionError('PassengerId values must be whole numbers')
+    if ids.min() < 0 or ids.max() > PASSENGER_ID_MAX:
+        raise SubmissionError(f'PassengerId values must be between 0 and {PASSENGER_ID_MAX}')
+    if not np.isin(predictions, (0, 1)).all():
+        raise SubmissionError('Survived values must be 0 or 1')
+
+    ids = ids.astype(np.int64)
+    unique_ids, counts = np.unique(ids, return_counts=True)
+    if (counts > 1).any():
+        duplicates = ', '.join(str(value) for value in unique_ids[counts > 1][:5])
+        raise SubmissionError(f'Duplicate PassengerId values: {duplicates}')
+    return ids, predictions.astype(np.int8)
+
+
+def _safe_ratio(numerator, denominator):
+    return float(numerator / denominator) if denominator else None
+
+
+def score_submission(ids, predictions):
+    """Accuracy, confusion matrix, precision/recall and per-segment accuracy against test_true.csv"""
+    table = get_table(SCORING_DATASET)
+    truth_ids = np.asarray(table['PassengerId'])
+
+    # Join on PassengerId: binary search of the submission ids in the sorted truth ids
+    order = np.argsort(truth_ids, kind='stable')
+    sorted_ids = truth_ids[order]
+    positions = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+    found = sorted_ids[positions] == ids
+    rows = order[positions[found]]
+
+    actual = np.asarray(table['Survived'])[rows].astype(np.int64)
+    predicted = predictions[found].astype(np.int64)
+    correct = actual == predicted
+
+    # Rows: actual died/survived; columns: predicted died/survived
+    confusion = np.bincount(actual * 2 + predicted, minlength=4).reshape(2, 2)
+    (true_negative, false_positive), (false_negative, true_positive) = confusion.tolist()
+    precision = _safe_ratio(true_positive, true_positive + false_positive)
+    recall = _safe_ratio(true_positive, true_positive + false_negative)
+
+    segments = {}
+    for name in SCORING_SEGMENTS:
+        codes, labels = table.dimension(name)
+        codes = np.asarray(codes)[rows]
+        totals = np.bincount(codes, minlength=len(labels))
+        hits = np.bincount(codes, weights=correct, minlength=len(labels))
+        segments[DIMENSIONS[name]] = [
+            {'segment': labels[code], 'passengers': int(totals[code]), 'accuracy': _safe_ratio(hits[code], totals[code])}
+            for code in np.flatnonzero(totals)
+        ]
+
+    return {
+        'rows': int(len(ids)),
+        'scored': int(found.sum()),
+        'unknown_ids': int((~found).sum()),
+        'missing': int(table.rows - found.sum()),
+        'accuracy': _safe_ratio(correct.sum(), len(correct)),
+        'confusion_matrix': confusion.tolist(),
+        'precision': precision,
+        'recall': recall,
+        'f1': _safe_ratio(2 * precision * recall, precision + recall) if precision and recall else None,
+        'segments': segments,
+    }
+
+
+def score_baseline():
+    """Score of the bundled gender_submission.csv (women survive, men do not)"""
+    with open(os.path.join(DATA_DIR, BASELINE_SUBMISSION), 'rb') as f:
+        return score_submission(*read_submission(f))
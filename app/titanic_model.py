@@ -0,0 +1,227 @@
+"""
+Baseline survival model for the Titanic data
+
+A logistic regression in plain NumPy. Features are built column-wise from
+the passenger fields: class and port one-hot, sex, a title taken from the
+name, age (imputed, with a missing flag), family size and log fare. Each
+feature is standardized with the training mean and scale. Fitting uses
+Newton's method (IRLS) with an L2 penalty and converges in a few
+iterations.
+
+scripts/train_model.py fits the model on data/train.csv and saves it as an
+.npz file. Workers load it once and score any number of passengers with a
+single matrix-vector product.
+"""
+import json
+import os
+import re
+import threading
+import numpy as np
+from app.titanic import DATA_DIR
+
+MODEL_PATH = os.path.join(DATA_DIR, 'models', 'logistic_regression.npz')
+
+TITLES = ('Mr', 'Mrs', 'Miss', 'Master')
+# Titles folded into the four common ones; anything else counts as 'rare'
+TITLE_ALIASES = {'Mlle': 'Miss', 'Ms': 'Miss', 'Mme': 'Mrs'}
+TITLE_PATTERN = re.compile(r',\s*([^.]+)\.')
+
+FEATURES = (
+    'pclass_2', 'pclass_3', 'male', 'title_mr', 'title_mrs', 'title_miss', 'title_master',
+    'age', 'age_missing', 'child', 'sibsp', 'parch', 'alone', 'log_fare', 'embarked_q', 'embarked_s',
+)
+FIELDS = ('Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked', 'Name')
+MAX_BATCH = 10000
+
+
+class PredictionError(ValueError):
+    """Passenger records that cannot be scored"""
+
+
+def sigmoid(z):
+    return 1 / (1 + np.exp(-z))
+
+
+def name_titles(names):
+    """Title per passenger ('Mr', 'Mrs', ... or 'rare'), parsing each distinct name once"""
+    distinct, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+    titles = []
+    for name in distinct.tolist():
+        match = TITLE_PATTERN.search(name)
+        title = TITLE_ALIASES.get(match.group(1), match.group(1)) if match else ''
+        titles.append(title if title in TITLES else 'rare')
+    return np.array(titles)[inverse]
+
+
+def table_columns(table):
+    """Passenger fields of an explorer Table as plain arrays (labels instead of category codes)"""
+    columns = {}
+    for field in FIELDS:
+        column = table[field]
+        if field in table.categories:
+            column = np.array(table.categories[field])[np.asarray(column)]
+        elif not isinstance(column, np.ndarray):
+            column = column[:]
+        columns[field] = np.asarray(column)
+    return columns
+
+
+def records_to_columns(records):
+    """Validate a list of passenger dicts (JSON) and turn it into typed columns"""
+    if not isinstance(records, list) or not records:
+        raise PredictionError('passengers must be a non-empty list')
+    if len(records) > MAX_BATCH:
+        raise PredictionError(f'At most {MAX_BATCH} passengers per request')
+    if not all(isinstance(record, dict) for record in records):
+        raise PredictionError('each passenger must be an object')
+
+    def numbers(field, default):
+        values = [record.get(field) for record in records]
+        try:
+            return np.array([default if value in (None, '') else value for value in values], dtype=np.float64)
+        except (TypeError, ValueError):
+            raise PredictionError(f'{field} must be a number')
+
+    columns = {
+        'Pclass': numbers('Pclass', np.nan),
+        'Age': numbers('Age', np.nan),
+        'SibSp': numbers('SibSp', 0),
+        'Parch': numbers('Parch', 0),
+        'Fare': numbers('Fare', np.nan),
+        'Sex': np.array([str(record.get('Sex') or '').lower() for record in records]),
+        'Embarked': np.array([str(record.get('Embarked') or '').upper() for record in records]),
+        'Name': np.array([str(record.get('Name') or '') for record in records]),
+    }
+    if not np.isin(columns['Pclass'], (1, 2, 3)).all():
+        raise PredictionError('Pclass must be 1, 2 or 3')
+    if not np.isin(columns['Sex'], ('male', 'female')).all():
+        raise PredictionError('Sex must be "male" or "female"')
+    return columns
+
+
+def raw_features(columns, fill_values):
+    """Unscaled feature matrix (rows x FEATURES) from passenger columns"""
+    pclass = np.asarray(columns['Pclass'], dtype=np.float64)
+    age = np.asarray(columns['Age'], dtype=np.float64)
+    fare = np.asarray(columns['Fare'], dtype=np.float64)
+    sibsp = np.asarray(columns['SibSp'], dtype=np.float64)
+    parch = np.asarray(columns['Parch'], dtype=np.float64)
+    embarked = np.asarray(columns['Embarked'])
+    embarked = np.where(np.isin(embarked, ('C', 'Q', 'S')), embarked, fill_values['embarked'])
+    titles = name_titles(columns['Name'])
+    age_missing = np.isnan(age)
+    age = np.where(age_missing, fill_values['age'], age)
+    fare = np.where(np.isnan(fare), fill_values['fare'], fare)
+
+    return np.column_stack([
+        pclass == 2,
+        pclass == 3,
+        np.asarray(columns['Sex']) == 'male',
+        titles == 'Mr',
+        titles == 'Mrs',
+        titles == 'Miss',
+        titles == 'Master',
+        age,
+        age_missing,
+        age < 13,
+        sibsp,
+        parch,
+        sibsp + parch == 0,
+        np.log1p(fare),
+        embarked == 'Q',
+        embarked == 'S',
+    ]).astype(np.float64)
+
+
+class LogisticModel:
+    """Fitted logistic regression with its preprocessing parameters"""
+
+    def __init__(self, weights, bias, means, scales, fill_values, meta=None):
+        self.weights = weights
+        self.bias = bias
+        self.means = means
+        self.scales = scales
+        self.fill_values = fill_values
+        self.meta = meta or {}
+
+    def features(self, columns):
+        return (raw_features(columns, self.fill_values) - self.means) / self.scales
+
+    def predict_proba(self, columns):
+        """Survival probability for every passenger in one vectorized pass"""
+        return sigmoid(self.features(columns) @ self.weights + self.bias)
+
+    def predict(self, columns, threshold=0.5):
+        return (self.predict_proba(columns) >= threshold).astype(np.int8)
+
+    def save(self, path=MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp.npz'
+        np.savez(temp_path, weights=self.weights, bias=np.array(self.bias), means=self.means, scales=self.scales,
+                 features=np.array(FEATURES), fill_values=np.array(json.dumps(self.fill_values)),
+                 meta=np.array(json.dumps(self.meta)))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            if tuple(data['features'].tolist()) != FEATURES:
+                raise ValueError('Model was trained with different features; retrain it')
+            return cls(data['weights'], float(data['bias']), data['means'], data['scales'],
+                       json.loads(str(data['fill_values'])), json.loads(str(data['meta'])))
+
+
+def fit(columns, survived, l2=1.0, max_iterations=50, tolerance=1e-8):
+    """Fit a LogisticModel with Newton's method; returns (model, iterations)"""
+    age = np.asarray(columns['Age'], dtype=np.float64)
+    fare = np.asarray(columns['Fare'], dtype=np.float64)
+    ports, counts = np.unique(columns['Embarked'][np.isin(columns['Embarked'], ('C', 'Q', 'S'))], return_counts=True)
+    fill_values = {
+        'age': float(np.nanmedian(age)),
+        'fare': float(np.nanmedian(fare)),
+        'embarked': str(ports[np.argmax(counts)]),
+    }
+
+    raw = raw_features(columns, fill_values)
+    means = raw.mean(axis=0)
+    scales = raw.std(axis=0)
+    scales[scales == 0] = 1
+    X = np.column_stack([np.ones(len(raw)), (raw - means) / scales])
+    y = np.asarray(survived, dtype=np.float64)
+
+    # The bias is not penalized
+    penalty = np.full(X.shape[1], l2)
+    penalty[0] = 0
+    w = np.zeros(X.shape[1])
+    for iteration in range(1, max_iterations + 1):
+        p = sigmoid(X @ w)
+        gradient = X.T @ (p - y) + penalty * w
+        hessian = (X.T * (p * (1 - p))) @ X + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.max(np.abs(step)) < tolerance:
+            break
+
+    return LogisticModel(w[1:], float(w[0]), means, scales, fill_values), iteration
+
+
+# Loaded model per worker: (mtime, LogisticModel)
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """The saved model, reloaded when the file changes; None if it hasn't been trained"""
+    global _model
+    try:
+        mtime = os.path.getmtime(MODEL_PATH)
+    except OSError:
+        return None
+
+    with _model_lock:
+        if _model and _model[0] == mtime:
+            return _model[1]
+    model = LogisticModel.load(MODEL_PATH)
+    with _model_lock:
+        _model = (mtime, model)
+    return model
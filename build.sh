@@ -6,5 +6,14 @@ set -o errexit
 # Install Python dependencies
 pip install -r requirements.txt
 
-# Initialize the database and run migrations
+# Compile the templates once, so workers load bytecode instead of parsing them on first use
+python scripts/precompile_templates.py --clear
+
+# Apply schema migrations (one run of the whole chain) and create the admin user
 python init_db.py
+
+# Convert data/*.csv to memory-mapped columnar files for the data explorer
+python scripts/convert_data.py
+
+# Train the baseline survival model served by /data/titanic/predict
+python scripts/train_model.py --no-benchmark
@@ -4,23 +4,116 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+
+def normalize_database_url(database_url):
+    """Render provides postgres:// URLs, SQLAlchemy expects postgresql://"""
+    if database_url and database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    return database_url
+
+
+def engine_options(database_url):
+    """SQLAlchemy engine options tuned for the given database backend"""
+    if database_url.startswith('sqlite'):
+        # Pragmas (WAL, synchronous, mmap, busy timeout) are applied per
+        # connection by a connect-event listener in create_app
+        return {
+            'connect_args': {
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000,
+            },
+        }
+    
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True,
+    }
+
+
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
     # Handle DATABASE_URL from Render (converts postgres:// to postgresql://)
-    database_url = os.environ.get('DATABASE_URL') or 'sqlite:///portfolio.db'
-    if database_url.startswith('postgres://'):
-        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    database_url = normalize_database_url(os.environ.get('DATABASE_URL') or 'sqlite:///portfolio.db')
     SQLALCHEMY_DATABASE_URI = database_url
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_url)
+    
+    # Optional read replica for public pages (see app.models.read_session)
+    database_read_url = normalize_database_url(os.environ.get('DATABASE_READ_URL'))
+    SQLALCHEMY_BINDS = {
+        'read': {'url': database_read_url, **engine_options(database_read_url)}
+    } if database_read_url else {}
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # SQLite connection pragmas (ignored for PostgreSQL)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 64 * 1024 * 1024)),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    }
+    
+    # Seconds a worker may serve the logged-in user from its identity cache
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+    
+    # Compiled templates cached on disk (default: instance/jinja_cache), filled by build.sh
+    JINJA_BYTECODE_CACHE = os.environ.get('JINJA_BYTECODE_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+    # Stat template files for changes on every render; unset follows debug mode (off in production)
+    templates_auto_reload = os.environ.get('TEMPLATES_AUTO_RELOAD')
+    TEMPLATES_AUTO_RELOAD = templates_auto_reload.lower() in ('1', 'true', 'yes') if templates_auto_reload else None
+    
+    # {% cache %} template fragments: 'memory' (per worker) or 'off'
+    FRAGMENT_CACHE_BACKEND = os.environ.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 3600))  # capped for presigned S3 URLs
+    FRAGMENT_CACHE_MAX_ENTRIES = 1000
+    
+    # Link: rel=preload headers for CSS, icon fonts and header images on HTML pages,
+    # also sent as 103 Early Hints when the server supports them (Gunicorn does)
+    PRELOAD_ENABLED = os.environ.get('PRELOAD_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    EARLY_HINTS = os.environ.get('EARLY_HINTS', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Response compression (Brotli needs the optional `brotli` package)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = 500  # bytes
+    COMPRESS_CACHE_MAX_BYTES = 8 * 1024 * 1024
+    
     # File upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = 'app/static/uploads'
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     
+    # Where uploads live: 'local' (UPLOAD_FOLDER) or 's3' (any S3-compatible bucket, e.g. MinIO)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')
+    S3_BUCKET = os.environ.get('S3_BUCKET')
+    S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')  # unset for AWS S3
+    S3_REGION = os.environ.get('S3_REGION')
+    # Public base URL for the bucket (CDN or public-read bucket); presigned URLs are used when unset
+    S3_PUBLIC_URL = os.environ.get('S3_PUBLIC_URL')
+    S3_PRESIGN_EXPIRES = int(os.environ.get('S3_PRESIGN_EXPIRES', 3600))
+    
+    # Local uploads: let the front proxy send the bytes ('x-accel-redirect' for nginx,
+    # 'x-sendfile' for Apache/lighttpd); unset serves them from the app
+    UPLOAD_SENDFILE = os.environ.get('UPLOAD_SENDFILE', '').lower() or None
+    UPLOAD_ACCEL_PREFIX = os.environ.get('UPLOAD_ACCEL_PREFIX', '/protected-uploads/')
+    UPLOAD_CACHE_MAX_AGE = 365 * 24 * 3600
+    
+    # Uploaded images are re-encoded without metadata and capped to this size
+    IMAGE_MAX_DIMENSION = int(os.environ.get('IMAGE_MAX_DIMENSION', 2000))
+    IMAGE_JPEG_QUALITY = 85
+    
+    # Login throttling: 'memory' (per worker), 'database' (login_throttle table, shared by
+    # all workers) or 'off'. Buckets are (capacity, seconds per refilled attempt).
+    LOGIN_THROTTLE_BACKEND = os.environ.get('LOGIN_THROTTLE_BACKEND', 'memory')
+    LOGIN_THROTTLE_IP = (10, 30)
+    LOGIN_THROTTLE_USERNAME = (10, 60)
+    # Trusted proxies in front of the app (e.g. 1 on Render); the client IP is read from X-Forwarded-For
+    LOGIN_THROTTLE_PROXY_COUNT = int(os.environ.get('LOGIN_THROTTLE_PROXY_COUNT', 0))
+    
     # Admin credentials from environment
     ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME', 'admin')
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'changeme')
@@ -0,0 +1,72 @@
+"""
+Gunicorn configuration for production
+Worker count, threads and worker class are derived from available CPUs and
+can be overridden with environment variables:
+
+    WEB_CONCURRENCY        number of worker processes (default: 2 * CPUs + 1)
+    GUNICORN_THREADS       threads per worker (default: 1, >1 switches to gthread)
+    GUNICORN_WORKER_CLASS  explicit worker class (sync, gthread, ...)
+    GUNICORN_PRELOAD       load the app once in the master before forking (default: true)
+    GUNICORN_TIMEOUT       worker timeout in seconds (default: 120)
+"""
+import os
+import multiprocessing
+
+
+def _env_int(name, default):
+    """Read an integer environment variable, falling back to default"""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _cpu_count():
+    """CPUs actually available to this process (respects container limits)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = max(1, _env_int('WEB_CONCURRENCY', _cpu_count() * 2 + 1))
+threads = max(1, _env_int('GUNICORN_THREADS', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS') or ('gthread' if threads > 1 else 'sync')
+
+timeout = _env_int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master process"""
+    if not preload_app:
+        return
+
+    from app.models import db
+    from wsgi import app
+
+    # Connections opened in the master (e.g. during app setup) must not be
+    # shared between processes; close=False leaves the parent's sockets alone
+    # and just gives this worker a fresh pool.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    server.log.info(f"Worker {worker.pid}: database pools reset")
+
+
+def when_ready(server):
+    """Log the effective concurrency settings on startup"""
+    server.log.info(
+        f"Serving with {workers} worker(s) x {threads} thread(s), "
+        f"class={worker_class}, preload={preload_app}"
+    )
@@ -1,21 +1,23 @@
 """
 Database initialization script for deployment
-Creates all tables and initializes admin user if needed
+Applies schema migrations and initializes admin user if needed
 """
 import os
-from app import create_app
+from flask_migrate import upgrade
+from app import create_app, init_migrate
 from app.models import db, User
 from config import Config
 
 def init_database():
     """Initialize database with tables and admin user"""
     app = create_app()
+    init_migrate(app)
     
     with app.app_context():
-        # Create all database tables
-        print("Creating database tables...")
-        db.create_all()
-        print("✓ Database tables created")
+        # Create or upgrade all database tables in a single migration run
+        print("Applying database migrations...")
+        upgrade()
+        print("✓ Database schema is up to date")
         
         # Check if admin user exists
         admin_username = Config.ADMIN_USERNAME
@@ -0,0 +1,59 @@
+"""Initial schema: user and project tables
+
+Revision ID: 0001_initial_schema
+Revises: 
+Create Date: 2025-11-16 00:00:00
+
+Databases created before migrations existed already have these tables
+(from db.create_all()), so each table is only created when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing_tables:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=80), nullable=False),
+            sa.Column('password_hash', sa.String(length=200), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('profile_photo_path', sa.String(length=200), nullable=True),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('linkedin_url', sa.String(length=200), nullable=True),
+            sa.Column('github_url', sa.String(length=200), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('username'),
+        )
+
+    if 'project' not in existing_tables:
+        op.create_table(
+            'project',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.String(length=500), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('github_url', sa.String(length=200), nullable=True),
+            sa.Column('image_path', sa.String(length=200), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('published', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    op.drop_table('project')
+    op.drop_table('user')
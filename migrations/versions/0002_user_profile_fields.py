@@ -0,0 +1,40 @@
+"""Add display_name, bio_header and about_text to user
+
+Revision ID: 0002_user_profile_fields
+Revises: 0001_initial_schema
+Create Date: 2025-11-16 00:00:01
+
+Replaces scripts/migrations/migrate_add_display_name.py,
+migrate_add_fields.py and migrate_add_about_text.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_user_profile_fields'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = [
+    sa.Column('display_name', sa.String(length=100), nullable=True, server_default=''),
+    sa.Column('bio_header', sa.String(length=200), nullable=True, server_default=''),
+    sa.Column('about_text', sa.Text(), nullable=True, server_default=''),
+]
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('user')}
+    missing = [column for column in NEW_COLUMNS if column.name not in existing]
+
+    if missing:
+        with op.batch_alter_table('user') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        for column in reversed(NEW_COLUMNS):
+            batch_op.drop_column(column.name)
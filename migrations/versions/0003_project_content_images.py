@@ -0,0 +1,30 @@
+"""Add content_images to project
+
+Revision ID: 0003_project_content_images
+Revises: 0002_user_profile_fields
+Create Date: 2025-11-16 00:00:02
+
+Replaces scripts/migrations/migrate_add_content_images.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_project_content_images'
+down_revision = '0002_user_profile_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('project')}
+
+    if 'content_images' not in existing:
+        with op.batch_alter_table('project') as batch_op:
+            batch_op.add_column(sa.Column('content_images', sa.Text(), nullable=True, server_default='[]'))
+
+
+def downgrade():
+    with op.batch_alter_table('project') as batch_op:
+        batch_op.drop_column('content_images')
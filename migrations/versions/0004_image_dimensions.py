@@ -0,0 +1,42 @@
+"""Add intrinsic image dimensions to user and project
+
+Revision ID: 0004_image_dimensions
+Revises: 0003_project_content_images
+Create Date: 2026-10-19 00:00:00
+
+Filled in at upload time; run `flask backfill-image-sizes` for images
+uploaded before this revision.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_image_dimensions'
+down_revision = '0003_project_content_images'
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = {
+    'user': ['profile_photo_width', 'profile_photo_height'],
+    'project': ['image_width', 'image_height'],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table, columns in NEW_COLUMNS.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        missing = [name for name in columns if name not in existing]
+        if missing:
+            with op.batch_alter_table(table) as batch_op:
+                for name in missing:
+                    batch_op.add_column(sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade():
+    for table, columns in NEW_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for name in reversed(columns):
+                batch_op.drop_column(name)
@@ -0,0 +1,34 @@
+"""Add the login_throttle table
+
+Revision ID: 0005_login_throttle
+Revises: 0004_image_dimensions
+Create Date: 2026-10-19 00:00:00
+
+Token buckets for LOGIN_THROTTLE_BACKEND=database, shared by all workers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_login_throttle'
+down_revision = '0004_image_dimensions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'login_throttle' not in inspector.get_table_names():
+        op.create_table(
+            'login_throttle',
+            sa.Column('key', sa.String(length=255), nullable=False),
+            sa.Column('tokens', sa.Float(), nullable=False),
+            sa.Column('updated_at', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('key'),
+        )
+
+
+def downgrade():
+    op.drop_table('login_throttle')
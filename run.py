@@ -1,3 +1,5 @@
+import os
+import click
 from app import create_app, db
 from app.models import User
 from config import Config
@@ -7,9 +9,11 @@ app = create_app()
 @app.cli.command()
 def init_db():
     """Initialize the database and create admin user"""
+    from flask_migrate import upgrade
+    
     with app.app_context():
-        # Create all tables
-        db.create_all()
+        # Create or upgrade all tables
+        upgrade()
         
         # Check if admin user already exists
         admin = User.query.filter_by(username=Config.ADMIN_USERNAME).first()
@@ -32,5 +36,108 @@ def init_db():
             print(f"✓ Database already initialized")
             print(f"✓ Admin user exists: {Config.ADMIN_USERNAME}")
 
+@app.cli.command('sync-read-replica')
+def sync_read_replica():
+    """Copy the primary SQLite database to the DATABASE_READ_URL file (local stand-in for a replica)"""
+    import sqlite3
+    
+    with app.app_context():
+        if 'read' not in db.engines:
+            print("⚠ DATABASE_READ_URL is not set, nothing to sync")
+            return
+        
+        primary, replica = db.engines[None], db.engines['read']
+        if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            print("⚠ Only SQLite-to-SQLite syncing is supported; use real replication for PostgreSQL")
+            return
+        
+        # The online backup API gives a consistent copy even while the app is writing
+        source = sqlite3.connect(primary.url.database)
+        target = sqlite3.connect(replica.url.database)
+        with target:
+            source.backup(target)
+        source.close()
+        target.close()
+        
+        print(f"✓ Read replica synced: {replica.url.database}")
+
+@app.cli.command('backfill-image-sizes')
+def backfill_image_sizes():
+    """Record width/height for profile photos and project images uploaded before sizes were stored"""
+    from app.images import image_size
+    from app.models import Project
+    
+    static_folder = app.static_folder
+    updated = 0
+    
+    with app.app_context():
+        rows = [(user, 'profile_photo') for user in User.query.filter(User.profile_photo_path != '').all()]
+        rows += [(project, 'image') for project in Project.query.filter(Project.image_path != '').all()]
+        
+        for obj, prefix in rows:
+            path = getattr(obj, f'{prefix}_path')
+            if not path or getattr(obj, f'{prefix}_width'):
+                continue
+            width, height = image_size(os.path.join(static_folder, path))
+            if width:
+                setattr(obj, f'{prefix}_width', width)
+                setattr(obj, f'{prefix}_height', height)
+                updated += 1
+        
+        db.session.commit()
+    
+    print(f"✓ Recorded dimensions for {updated} images")
+
+@app.cli.command('import-profile')
+@click.option('--top', default=15, help='Number of modules to list')
+@click.option('--runs', default=3, help='Cold starts to average for time-to-first-request')
+def import_profile(top, runs):
+    """Report import cost (-X importtime) and time-to-first-request of a fresh worker"""
+    import subprocess
+    import sys
+    
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    # Profile what a gunicorn worker imports, not what the CLI has loaded
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import wsgi'],
+        cwd=project_dir, env=env, capture_output=True, text=True, check=True,
+    )
+    
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    
+    total_us = sum(cumulative for cumulative, _, depth, _ in modules if depth == 0)
+    print(f"Import time for `import wsgi`: {total_us / 1000:.1f} ms across {len(modules)} modules\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, depth, name in sorted(modules, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {'  ' * depth}{name}")
+    
+    # Time from interpreter start to the first response, as a fresh worker sees it
+    probe = (
+        "import time; start = time.perf_counter()\n"
+        "import wsgi\n"
+        "wsgi.app.test_client().get('/')\n"
+        "print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', probe],
+            cwd=project_dir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    
+    print(f"\nTime to first request: {min(timings) * 1000:.0f} ms best, "
+          f"{sum(timings) / len(timings) * 1000:.0f} ms mean over {runs} cold starts")
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -1,54 +1,607 @@
 """
 Simple backup script for portfolio website
-Creates backups of database and uploaded files
+Creates incremental backups of database and uploaded files
+
+Layout of the backups directory:
+    backups/objects/ab/abcdef...   file contents, stored once per SHA-256
+    backups/manifests/backup_<timestamp>.json
+                                   what each run contained (path -> hash)
+
+Files that haven't changed since the previous run are only referenced by
+the new manifest, so a run costs time and space proportional to what changed.
+
+The database is captured as a consistent online snapshot rather than a raw
+file copy: SQLite through its backup API (copied a few pages at a time so
+the running app is never locked out), PostgreSQL through pg_dump. Snapshots
+are stored gzip-compressed and checked against their SHA-256 on restore.
+
+Archive mode (--archive) instead streams the snapshot and uploads into a
+single compressed tar file (multi-threaded zstd when the optional
+`zstandard` package is installed, otherwise gzip via `pigz` or Python).
+Every member carries its SHA-256 in a PAX header, and restore verifies each
+file as it is extracted.
+
+Usage:
+    python scripts/backup.py                     create a backup
+    python scripts/backup.py create --archive    create a single compressed archive
+    python scripts/backup.py list                list backups
+    python scripts/backup.py restore <name>      restore a backup or archive into the current directory
 """
-import shutil
+import argparse
+import gzip
+import hashlib
+import io
+import json
 import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
-def create_backup():
-    """Create backup of database and uploads folder"""
-    
+# Allow `python scripts/backup.py` to import the project's config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.engine import make_url
+from config import Config
+
+BACKUP_DIR = 'backups'
+UPLOADS_DIR = 'app/static/uploads'
+INSTANCE_DIR = 'instance'
+# Manifest and archive names; microseconds so runs in the same second don't collide
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f'
+
+# SQLite pages copied per backup step, and the pause that lets writers in between steps
+SNAPSHOT_PAGES_PER_STEP = 256
+SNAPSHOT_STEP_SLEEP = 0.005
+
+# Archive settings
+ARCHIVE_CHECKSUM_KEY = 'PORTFOLIO.sha256'
+ARCHIVE_INDEX_NAME = 'MANIFEST.json'
+ARCHIVE_EXTENSIONS = {'zstd': 'tar.zst', 'gzip': 'tar.gz'}
+ZSTD_LEVEL = 10
+# pg_dump output is held in memory up to this size before spilling to a temp file
+DUMP_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+
+def find_database_file(database_url=None):
+    """Locate the SQLite database file (Flask-SQLAlchemy resolves relative paths under instance/)"""
+    url = make_url(database_url or Config.SQLALCHEMY_DATABASE_URI)
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return None
+
+    candidates = [url.database] if os.path.isabs(url.database) else [
+        os.path.join(INSTANCE_DIR, url.database),
+        url.database,
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def database_member_name(db_file):
+    """Relative name of a SQLite snapshot in manifests and archives, whatever the live path"""
+    return f'{INSTANCE_DIR}/{os.path.basename(db_file)}'
+
+
+def hash_file(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_path(backup_dir, sha256):
+    """Location of an object in the content-addressed store"""
+    return os.path.join(backup_dir, 'objects', sha256[:2], sha256)
+
+
+def store_object(backup_dir, source_path, sha256):
+    """Copy a file into the object store unless identical content is already there"""
+    target = object_path(backup_dir, sha256)
+    if os.path.exists(target):
+        return False
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_target = target + '.tmp'
+    shutil.copy2(source_path, temp_target)
+    os.replace(temp_target, target)
+    return True
+
+
+def store_compressed(backup_dir, stream):
+    """
+    Gzip a binary stream into the object store.
+    Returns the manifest entry: sha256 of the stored (compressed) object,
+    plus the sha256 and size of the uncompressed data for verification.
+    """
+    temp_dir = os.path.join(backup_dir, 'tmp')
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, f'snapshot_{os.getpid()}.gz')
+
+    raw_digest = hashlib.sha256()
+    raw_size = 0
+    # mtime=0 and an empty name (not the temp file's) keep the output deterministic,
+    # so an unchanged database dedupes
+    with open(temp_path, 'wb') as raw_out, \
+            gzip.GzipFile(filename='', fileobj=raw_out, mode='wb', mtime=0) as out:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+            raw_digest.update(chunk)
+            raw_size += len(chunk)
+            out.write(chunk)
+
+    sha256 = hash_file(temp_path)
+    target = object_path(backup_dir, sha256)
+    if os.path.exists(target):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+
+    return {
+        'sha256': sha256,
+        'compressed_size': os.path.getsize(target),
+        'compression': 'gzip',
+        'raw_sha256': raw_digest.hexdigest(),
+        'size': raw_size,
+    }
+
+
+def snapshot_sqlite(db_path, snapshot_path):
+    """Consistent copy of a live SQLite database using the online backup API"""
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(snapshot_path)
+    try:
+        with target:
+            source.backup(target, pages=SNAPSHOT_PAGES_PER_STEP, sleep=SNAPSHOT_STEP_SLEEP)
+        # Store a self-contained file rather than one that expects a -wal sidecar
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        source.close()
+        target.close()
+
+
+def snapshot_sqlite_bytes(db_path):
+    """Consistent snapshot of a live SQLite database, held in memory as file bytes"""
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(':memory:')
+    try:
+        source.backup(target, pages=SNAPSHOT_PAGES_PER_STEP, sleep=SNAPSHOT_STEP_SLEEP)
+        return target.serialize()
+    finally:
+        source.close()
+        target.close()
+
+
+def pg_dump_process(url):
+    """Start pg_dump for a SQLAlchemy URL, with the plain SQL dump on stdout"""
+    # pg_dump wants a libpq URL, without the SQLAlchemy driver suffix
+    libpq_url = url.set(drivername='postgresql').render_as_string(hide_password=False)
+    return subprocess.Popen(
+        ['pg_dump', '--no-owner', '--no-privileges', '--dbname', libpq_url],
+        stdout=subprocess.PIPE,
+    )
+
+
+def snapshot_database(backup_dir, database_url=None):
+    """Snapshot the configured database into the object store and return its manifest entry"""
+    database_url = database_url or Config.SQLALCHEMY_DATABASE_URI
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+
+    if backend == 'sqlite':
+        db_file = find_database_file(database_url)
+        if not db_file:
+            return None
+
+        temp_dir = os.path.join(backup_dir, 'tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        snapshot_path = os.path.join(temp_dir, f'snapshot_{os.getpid()}.db')
+        try:
+            snapshot_sqlite(db_file, snapshot_path)
+            with open(snapshot_path, 'rb') as stream:
+                entry = store_compressed(backup_dir, stream)
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+        return dict(entry, path=database_member_name(db_file), format='sqlite')
+
+    if backend == 'postgresql':
+        process = pg_dump_process(url)
+        entry = store_compressed(backup_dir, process.stdout)
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"pg_dump failed with exit code {process.returncode}")
+        return dict(entry, path='database.sql', format='pg_dump')
+
+    raise ValueError(f"Unsupported database backend for backups: {backend}")
+
+
+def list_manifests(backup_dir):
+    """Manifest file names, oldest first"""
+    manifest_dir = os.path.join(backup_dir, 'manifests')
+    if not os.path.isdir(manifest_dir):
+        return []
+    return sorted(name for name in os.listdir(manifest_dir) if name.endswith('.json'))
+
+
+def load_manifest(backup_dir, name):
+    """Read a manifest by file name"""
+    with open(os.path.join(backup_dir, 'manifests', name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def manifest_objects(manifest):
+    """All object hashes referenced by a manifest"""
+    entries = list(manifest.get('files', {}).values())
+    if manifest.get('database'):
+        entries.append(manifest['database'])
+    return {entry['sha256'] for entry in entries}
+
+
+def backup_file(backup_dir, path, previous_entry, stats):
+    """Add one file to the store, reusing the previous hash when size and mtime match"""
+    stat = os.stat(path)
+    if previous_entry and previous_entry.get('size') == stat.st_size and previous_entry.get('mtime') == stat.st_mtime:
+        sha256 = previous_entry['sha256']
+    else:
+        sha256 = hash_file(path)
+
+    # Unchanged content may still be missing if its object was garbage collected
+    if store_object(backup_dir, path, sha256):
+        stats['copied'] += 1
+        stats['bytes'] += stat.st_size
+    else:
+        stats['referenced'] += 1
+
+    return {'sha256': sha256, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def create_backup(backup_dir=BACKUP_DIR):
+    """Create an incremental backup of database and uploads folder"""
+
     # Create backups directory if it doesn't exist
-    backup_dir = 'backups'
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-    
+    os.makedirs(os.path.join(backup_dir, 'manifests'), exist_ok=True)
+
     # Generate timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+
+    manifests = list_manifests(backup_dir)
+    previous = load_manifest(backup_dir, manifests[-1]) if manifests else {}
+    previous_files = previous.get('files', {})
+    stats = {'copied': 0, 'referenced': 0, 'bytes': 0}
+    manifest = {'created': datetime.now().isoformat(timespec='seconds'), 'database': None, 'files': {}}
+
     # Backup database
-    db_file = 'portfolio.db'
-    if os.path.exists(db_file):
-        backup_db = os.path.join(backup_dir, f'portfolio_{timestamp}.db')
-        shutil.copy(db_file, backup_db)
-        print(f"✓ Database backed up: {backup_db}")
+    manifest['database'] = snapshot_database(backup_dir)
+    if manifest['database']:
+        database = manifest['database']
+        print(f"✓ Database snapshot ({database['format']}): "
+              f"{database['size'] / 1024:.1f} KB -> {database['compressed_size'] / 1024:.1f} KB gzip")
     else:
         print("⚠ Database file not found, skipping database backup")
-    
+
     # Backup uploads folder
-    uploads_dir = 'app/static/uploads'
-    if os.path.exists(uploads_dir):
-        backup_uploads = os.path.join(backup_dir, f'uploads_{timestamp}')
-        shutil.copytree(uploads_dir, backup_uploads)
-        print(f"✓ Uploads backed up: {backup_uploads}")
+    if os.path.exists(UPLOADS_DIR):
+        for root, dirs, files in os.walk(UPLOADS_DIR):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                relpath = os.path.relpath(path, UPLOADS_DIR).replace('\\', '/')
+                manifest['files'][relpath] = backup_file(backup_dir, path, previous_files.get(relpath), stats)
+        print(f"✓ Uploads backed up: {len(manifest['files'])} files")
     else:
         print("⚠ Uploads directory not found, skipping uploads backup")
-    
+
+    manifest_name = f'backup_{timestamp}.json'
+    # 'x' refuses to overwrite another run's manifest
+    with open(os.path.join(backup_dir, 'manifests', manifest_name), 'x', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
     print(f"\n✓ Backup completed successfully at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Manifest: {manifest_name}")
+    print(f"  New objects: {stats['copied']} ({stats['bytes'] / 1024:.1f} KB), "
+          f"unchanged: {stats['referenced']}")
     print(f"  Backups are stored in: {os.path.abspath(backup_dir)}")
-    
+
     # Clean up old backups (keep last 30 days)
     cleanup_old_backups(backup_dir, days=30)
+    return manifest_name
+
+
+def restore_backup(name, target_dir='.', backup_dir=BACKUP_DIR):
+    """Restore the database and uploads recorded in a manifest"""
+    manifest = load_manifest(backup_dir, name)
+
+    # Every target is resolved (and a crafted ../ or absolute path rejected) before anything is written
+    uploads_target = os.path.join(target_dir, UPLOADS_DIR)
+    entries = [(relpath, safe_restore_path(uploads_target, relpath), entry)
+               for relpath, entry in manifest['files'].items()]
+
+    for relpath, target, entry in entries:
+        source = object_path(backup_dir, entry['sha256'])
+        if hash_file(source) != entry['sha256']:
+            raise ValueError(f"Checksum mismatch for {relpath}; backup object is corrupt")
+
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        shutil.copy2(source, target)
+
+    database = manifest.get('database')
+    if database:
+        # Older manifests recorded the live (possibly absolute) SQLite path; never restore outside target_dir
+        relpath = database['path'] if database.get('format') == 'pg_dump' else database_member_name(database['path'])
+        restore_database_snapshot(backup_dir, database, safe_restore_path(target_dir, relpath))
+        if database.get('format') == 'pg_dump':
+            print(f"  Load the SQL dump with: psql \"$DATABASE_URL\" < {database['path']}")
+
+    print(f"✓ Restored {len(entries)} files{' and the database' if database else ''} from {name}")
+
+
+def restore_database_snapshot(backup_dir, entry, target):
+    """Decompress a database snapshot, verifying both checksums"""
+    source = object_path(backup_dir, entry['sha256'])
+    if hash_file(source) != entry['sha256']:
+        raise ValueError("Checksum mismatch for database snapshot; backup object is corrupt")
+
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    temp_target = target + '.restore'
+    digest = hashlib.sha256()
+    with gzip.open(source, 'rb') as stream, open(temp_target, 'wb') as out:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+            digest.update(chunk)
+            out.write(chunk)
+
+    if digest.hexdigest() != entry['raw_sha256']:
+        os.remove(temp_target)
+        raise ValueError("Checksum mismatch for decompressed database snapshot")
+    os.replace(temp_target, target)
+
+
+def default_compression():
+    """zstd when the optional zstandard package is installed, otherwise gzip"""
+    try:
+        import zstandard  # noqa: F401
+        return 'zstd'
+    except ImportError:
+        return 'gzip'
+
+
+@contextmanager
+def compressed_writer(path, compression):
+    """Writable stream that compresses into path, using every CPU where possible"""
+    with open(path, 'wb') as raw:
+        if compression == 'zstd':
+            import zstandard
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+            with compressor.stream_writer(raw, closefd=False) as out:
+                yield out
+        elif shutil.which('pigz'):
+            process = subprocess.Popen(['pigz', '-c'], stdin=subprocess.PIPE, stdout=raw)
+            try:
+                yield process.stdin
+            finally:
+                process.stdin.close()
+                if process.wait() != 0:
+                    raise RuntimeError(f"pigz failed with exit code {process.returncode}")
+        else:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as out:
+                yield out
+
+
+@contextmanager
+def compressed_reader(path):
+    """Readable stream that decompresses an archive based on its extension"""
+    with open(path, 'rb') as raw:
+        if path.endswith('.zst'):
+            import zstandard
+            with zstandard.ZstdDecompressor().stream_reader(raw, closefd=False) as stream:
+                yield stream
+        else:
+            with gzip.GzipFile(fileobj=raw, mode='rb') as stream:
+                yield stream
+
+
+def add_archive_member(tar, name, fileobj, size, sha256, mtime=None):
+    """Append a file to a streaming tar, recording its checksum in a PAX header"""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = mtime or time.time()
+    info.mode = 0o644
+    info.pax_headers = {ARCHIVE_CHECKSUM_KEY: sha256}
+    tar.addfile(info, fileobj)
+
+
+def archive_database_snapshot(database_url=None):
+    """Database snapshot for an archive as (name, file object, size, sha256), without touching disk"""
+    database_url = database_url or Config.SQLALCHEMY_DATABASE_URI
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+
+    if backend == 'sqlite':
+        db_file = find_database_file(database_url)
+        if not db_file:
+            return None
+        data = snapshot_sqlite_bytes(db_file)
+        return database_member_name(db_file), io.BytesIO(data), len(data), hashlib.sha256(data).hexdigest()
+
+    if backend == 'postgresql':
+        # tar needs each member's size up front, so the dump is spooled (in memory when small)
+        process = pg_dump_process(url)
+        spool = tempfile.SpooledTemporaryFile(max_size=DUMP_SPOOL_MAX_SIZE)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: process.stdout.read(1024 * 1024), b''):
+            digest.update(chunk)
+            spool.write(chunk)
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"pg_dump failed with exit code {process.returncode}")
+        size = spool.tell()
+        spool.seek(0)
+        return 'database.sql', spool, size, digest.hexdigest()
+
+    raise ValueError(f"Unsupported database backend for backups: {backend}")
+
+
+def create_archive(backup_dir=BACKUP_DIR, compression=None):
+    """Stream the database snapshot and uploads into one compressed tar archive"""
+    compression = compression or default_compression()
+    os.makedirs(backup_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    archive_path = os.path.join(backup_dir, f'backup_{timestamp}.{ARCHIVE_EXTENSIONS[compression]}')
+    partial_path = archive_path + '.partial'
+    if os.path.exists(archive_path) or os.path.exists(partial_path):
+        raise FileExistsError(f"Refusing to overwrite existing archive: {archive_path}")
+    index = {'created': datetime.now().isoformat(timespec='seconds'), 'compression': compression, 'files': {}}
+
+    with compressed_writer(partial_path, compression) as out, \
+            tarfile.open(fileobj=out, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+        # Database first, straight from memory
+        snapshot = archive_database_snapshot()
+        if snapshot:
+            name, fileobj, size, sha256 = snapshot
+            add_archive_member(tar, name, fileobj, size, sha256)
+            fileobj.close()
+            index['files'][name] = sha256
+            print(f"✓ Database snapshot archived: {name} ({size / 1024:.1f} KB)")
+        else:
+            print("⚠ Database file not found, skipping database backup")
+
+        # Uploads, read straight from their original location
+        upload_count = 0
+        if os.path.exists(UPLOADS_DIR):
+            for root, dirs, files in os.walk(UPLOADS_DIR):
+                dirs.sort()
+                for file_name in sorted(files):
+                    path = os.path.join(root, file_name)
+                    name = os.path.relpath(path, '.').replace('\\', '/')
+                    sha256 = hash_file(path)
+                    stat = os.stat(path)
+                    with open(path, 'rb') as fileobj:
+                        add_archive_member(tar, name, fileobj, stat.st_size, sha256, stat.st_mtime)
+                    index['files'][name] = sha256
+                    upload_count += 1
+            print(f"✓ Uploads archived: {upload_count} files")
+        else:
+            print("⚠ Uploads directory not found, skipping uploads backup")
+
+        # The index goes last so it can list every member; restore uses it to detect truncation
+        data = json.dumps(index, indent=2, sort_keys=True).encode('utf-8')
+        add_archive_member(tar, ARCHIVE_INDEX_NAME, io.BytesIO(data), len(data), hashlib.sha256(data).hexdigest())
+
+    if os.path.exists(archive_path):
+        os.remove(partial_path)
+        raise FileExistsError(f"Refusing to overwrite existing archive: {archive_path}")
+    os.replace(partial_path, archive_path)
+    print(f"\n✓ Archive written: {archive_path} ({os.path.getsize(archive_path) / 1024:.1f} KB, {compression})")
+    return archive_path
+
+
+def safe_restore_path(target_dir, name):
+    """Map an archive member name to a path inside target_dir, rejecting traversal"""
+    normalized = os.path.normpath(name)
+    if os.path.isabs(normalized) or normalized == '..' or normalized.startswith('..' + os.sep):
+        raise ValueError(f"Refusing to restore unsafe path from archive: {name}")
+    return os.path.join(target_dir, normalized)
+
+
+def restore_archive(path, target_dir='.'):
+    """Stream-extract an archive, verifying each file's checksum before moving it into place"""
+    restored = {}
+    index = None
+
+    with compressed_reader(path) as stream, tarfile.open(fileobj=stream, mode='r|') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+
+            expected = member.pax_headers.get(ARCHIVE_CHECKSUM_KEY)
+            if not expected:
+                raise ValueError(f"Archive member {member.name} has no checksum")
+
+            source = tar.extractfile(member)
+            if member.name == ARCHIVE_INDEX_NAME:
+                data = source.read()
+                if hashlib.sha256(data).hexdigest() != expected:
+                    raise ValueError("Checksum mismatch for archive index")
+                index = json.loads(data)
+                continue
+
+            target = safe_restore_path(target_dir, member.name)
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            temp_target = target + '.restore'
+            digest = hashlib.sha256()
+            try:
+                with open(temp_target, 'wb') as out:
+                    for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                        out.write(chunk)
+                if digest.hexdigest() != expected:
+                    raise ValueError(f"Checksum mismatch for {member.name}; archive is corrupt")
+            except Exception:
+                os.remove(temp_target)
+                raise
+            os.replace(temp_target, target)
+            restored[member.name] = expected
+
+    if index is None:
+        raise ValueError("Archive index not found; the archive may be truncated")
+    missing = set(index['files']) - set(restored)
+    if missing:
+        raise ValueError(f"Archive is missing {len(missing)} files listed in its index")
+
+    print(f"✓ Restored {len(restored)} files from {os.path.basename(path)} (all checksums verified)")
+
+
+def is_legacy_backup(name):
+    """Whether name is a backup written by the old full-copy format"""
+    return (name.startswith('portfolio_') and name.endswith('.db')) or name.startswith('uploads_')
+
 
 def cleanup_old_backups(backup_dir, days=30):
-    """Remove backups older than specified days"""
-    import time
-    
+    """Remove manifests older than specified days and garbage collect unreferenced objects"""
     current_time = time.time()
     days_in_seconds = days * 24 * 60 * 60
-    
+
+    # Expire old manifests, but always keep the newest one
+    manifests = list_manifests(backup_dir)
+    for name in manifests[:-1]:
+        path = os.path.join(backup_dir, 'manifests', name)
+        if os.path.getmtime(path) < (current_time - days_in_seconds):
+            os.remove(path)
+            print(f"  Removed old backup: {name}")
+
+    # Mark: every object still referenced by a remaining manifest
+    referenced = set()
+    for name in list_manifests(backup_dir):
+        referenced |= manifest_objects(load_manifest(backup_dir, name))
+
+    # Sweep: delete objects nothing refers to any more
+    removed, freed = 0, 0
+    objects_dir = os.path.join(backup_dir, 'objects')
+    if os.path.isdir(objects_dir):
+        for root, dirs, files in os.walk(objects_dir):
+            for name in files:
+                if name not in referenced:
+                    path = os.path.join(root, name)
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    removed += 1
+    if removed:
+        print(f"  Removed {removed} unreferenced objects ({freed / 1024:.1f} KB)")
+
+    # Loose backups from the old full-copy format (portfolio_<timestamp>.db, uploads_<timestamp>/).
+    # Archives (--archive) and anything else in the folder are left alone
     for item in os.listdir(backup_dir):
+        if not is_legacy_backup(item):
+            continue
         item_path = os.path.join(backup_dir, item)
         if os.path.getmtime(item_path) < (current_time - days_in_seconds):
             if os.path.isfile(item_path):
@@ -58,6 +611,46 @@ def cleanup_old_backups(backup_dir, days=30):
                 shutil.rmtree(item_path)
                 print(f"  Removed old backup folder: {item}")
 
+
+def list_backups(backup_dir=BACKUP_DIR):
+    """Print available backups"""
+    if not os.path.isdir(backup_dir):
+        print("No backups found")
+        return
+    manifests = list_manifests(backup_dir)
+    for name in manifests:
+        manifest = load_manifest(backup_dir, name)
+        print(f"  {name}  {manifest['created']}  {len(manifest['files'])} files"
+              f"{'  + database' if manifest.get('database') else ''}")
+    for name in sorted(os.listdir(backup_dir)):
+        if name.endswith(tuple(ARCHIVE_EXTENSIONS.values())):
+            size = os.path.getsize(os.path.join(backup_dir, name))
+            print(f"  {name}  archive  {size / 1024:.1f} KB")
+
+
 if __name__ == '__main__':
-    print("Starting backup process...")
-    create_backup()
+    parser = argparse.ArgumentParser(description='Backup and restore the portfolio website')
+    subparsers = parser.add_subparsers(dest='command')
+    create_parser = subparsers.add_parser('create', help='Create a backup (default)')
+    create_parser.add_argument('--archive', action='store_true', help='Write a single compressed archive')
+    create_parser.add_argument('--compression', choices=sorted(ARCHIVE_EXTENSIONS), help='Archive compression')
+    subparsers.add_parser('list', help='List backups')
+    restore_parser = subparsers.add_parser('restore', help='Restore a backup')
+    restore_parser.add_argument('name', help='Manifest or archive name, e.g. backup_20250101_120000.json')
+    restore_parser.add_argument('--target', default='.', help='Directory to restore into')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        list_backups()
+    elif args.command == 'restore':
+        if args.name.endswith(tuple(ARCHIVE_EXTENSIONS.values())):
+            archive = args.name if os.path.exists(args.name) else os.path.join(BACKUP_DIR, args.name)
+            restore_archive(archive, args.target)
+        else:
+            restore_backup(args.name, args.target)
+    elif args.command == 'create' and args.archive:
+        print("Starting archive backup...")
+        create_archive(compression=args.compression)
+    else:
+        print("Starting backup process...")
+        create_backup()
@@ -0,0 +1,89 @@
+"""
+Simple HTTP benchmark harness for the portfolio website
+Fires concurrent GET requests at a running server and reports throughput
+and latency percentiles.
+
+Usage:
+    python scripts/benchmark.py --url http://127.0.0.1:5000 --concurrency 16 --duration 10
+    python scripts/benchmark.py --paths / /about /project/1
+"""
+import argparse
+import time
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch(url, timeout):
+    """Fetch a URL and return (status, seconds)"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def worker(base_url, paths, deadline, timeout):
+    """Request paths round-robin until the deadline and collect results"""
+    results = []
+    i = 0
+    while time.perf_counter() < deadline:
+        results.append(fetch(base_url + paths[i % len(paths)], timeout))
+        i += 1
+    return results
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(base_url, paths, concurrency, duration, timeout=30):
+    """Run the benchmark and return a summary dict"""
+    base_url = base_url.rstrip('/')
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker, base_url, paths, deadline, timeout) for _ in range(concurrency)]
+        results = [r for f in futures for r in f.result()]
+
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for _, seconds in results)
+    errors = sum(1 for status, _ in results if status == 0 or status >= 500)
+
+    return {
+        'requests': len(results),
+        'errors': errors,
+        'elapsed': elapsed,
+        'rps': len(results) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark a running portfolio server')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Base URL of the server')
+    parser.add_argument('--paths', nargs='+', default=['/', '/about'], help='Paths to request')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to run')
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.url} {args.paths} with {args.concurrency} clients for {args.duration}s...")
+    summary = run_benchmark(args.url, args.paths, args.concurrency, args.duration)
+
+    print(f"✓ {summary['requests']} requests in {summary['elapsed']:.1f}s "
+          f"({summary['errors']} errors)")
+    print(f"  Throughput: {summary['rps']:.1f} req/s")
+    print(f"  Latency p50: {summary['p50_ms']:.1f} ms  "
+          f"p95: {summary['p95_ms']:.1f} ms  p99: {summary['p99_ms']:.1f} ms")
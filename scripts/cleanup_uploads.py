@@ -0,0 +1,137 @@
+"""
+Orphaned upload garbage collector
+Finds uploaded files that no Project or User references any more (deleted
+projects, replaced images and profile photos) and reports, quarantines or
+deletes them. Works with any storage backend; --quarantine needs local storage.
+
+Usage:
+    python scripts/cleanup_uploads.py                 dry run: report reclaimable bytes
+    python scripts/cleanup_uploads.py --quarantine    move orphans to quarantine/ (reversible)
+    python scripts/cleanup_uploads.py --delete        delete orphans
+
+To run it on a schedule, add a cron entry on the machine that holds the uploads, e.g.
+    0 3 * * 0  cd /path/to/site && venv/bin/python scripts/cleanup_uploads.py --quarantine
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from datetime import datetime
+
+# Allow `python scripts/cleanup_uploads.py` to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app import create_app
+from app.models import db, User, Project
+from app.storage import get_storage
+
+QUARANTINE_DIR = 'quarantine'
+IGNORED_FILES = {'.gitkeep'}
+
+# Upload paths mentioned in Markdown/HTML text, e.g. ![x](/static/uploads/projects/a.png)
+UPLOAD_REFERENCE_PATTERN = re.compile(r'uploads/[^\s)"\'<>]+')
+
+
+def referenced_upload_paths():
+    """Every upload path referenced from the database, as 'uploads/...' web paths"""
+    referenced = set()
+
+    def add_text_references(text):
+        if text:
+            referenced.update(UPLOAD_REFERENCE_PATTERN.findall(text))
+
+    for image_path, content_images, content in db.session.execute(
+        select(Project.image_path, Project.content_images, Project.content)
+    ):
+        if image_path:
+            referenced.add(image_path)
+        try:
+            referenced.update(json.loads(content_images) if content_images else [])
+        except (json.JSONDecodeError, TypeError):
+            pass
+        add_text_references(content)
+
+    for photo_path, bio, about_text in db.session.execute(
+        select(User.profile_photo_path, User.bio, User.about_text)
+    ):
+        if photo_path:
+            referenced.add(photo_path)
+        add_text_references(bio)
+        add_text_references(about_text)
+
+    return referenced
+
+
+def find_orphans(storage, referenced, min_age_seconds=3600):
+    """Stored uploads not in referenced, skipping very recent ones that may belong to an in-flight request"""
+    cutoff = time.time() - min_age_seconds
+    orphans = []
+
+    for key, size, mtime in storage.iter_files():
+        if key.rsplit('/', 1)[-1] in IGNORED_FILES:
+            continue
+        if key in referenced or mtime > cutoff:
+            continue
+        orphans.append((key, size))
+
+    return sorted(orphans)
+
+
+def cleanup_uploads(mode='dry-run', min_age_hours=1):
+    """Report, quarantine or delete orphaned uploads; returns (count, bytes)"""
+    app = create_app()
+
+    with app.app_context():
+        storage = get_storage()
+        if storage.name == 'local' and not os.path.isdir(storage.upload_folder):
+            print(f"⚠ Upload folder not found: {storage.upload_folder}")
+            return 0, 0
+        if mode == 'quarantine' and storage.name != 'local':
+            print(f"⚠ --quarantine only works with local storage; use --delete (and bucket versioning) for {storage.name}")
+            return 0, 0
+
+        referenced = referenced_upload_paths()
+        orphans = find_orphans(storage, referenced, min_age_seconds=min_age_hours * 3600)
+
+        total_bytes = sum(size for _, size in orphans)
+        quarantine_root = os.path.join(QUARANTINE_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+
+        for key, size in orphans:
+            if mode == 'delete':
+                storage.delete(key)
+                print(f"  Deleted {key} ({size / 1024:.1f} KB)")
+            elif mode == 'quarantine':
+                target = os.path.join(quarantine_root, key)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(storage.path(key), target)
+                print(f"  Quarantined {key} ({size / 1024:.1f} KB)")
+            else:
+                print(f"  Orphan: {key} ({size / 1024:.1f} KB)")
+
+    print(f"\n✓ {len(referenced)} referenced paths, {len(orphans)} orphaned files")
+    if mode == 'dry-run':
+        print(f"  Reclaimable: {total_bytes / 1024:.1f} KB (dry run, nothing changed)")
+    elif mode == 'quarantine':
+        print(f"  Moved {total_bytes / 1024:.1f} KB to {os.path.abspath(quarantine_root)}")
+    else:
+        print(f"  Reclaimed: {total_bytes / 1024:.1f} KB")
+
+    return len(orphans), total_bytes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find and remove uploads no longer referenced by any project or profile')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--delete', action='store_true', help='Delete orphaned files')
+    action.add_argument('--quarantine', action='store_true', help=f'Move orphaned files to {QUARANTINE_DIR}/')
+    parser.add_argument('--min-age-hours', type=float, default=1,
+                        help='Ignore files newer than this (default: 1 hour)')
+    args = parser.parse_args()
+
+    mode = 'delete' if args.delete else 'quarantine' if args.quarantine else 'dry-run'
+    print(f"Scanning uploads ({mode})...")
+    cleanup_uploads(mode, args.min_age_hours)
@@ -0,0 +1,62 @@
+"""
+Convert the data/ CSVs to binary columnar files
+Writes data/columnar/<name>/ for every data/<name>.csv (see app/columnar.py).
+The explorer memory-maps these instead of parsing the CSVs on every worker
+boot; a conversion whose CSV has since changed is ignored until re-run.
+
+Usage:
+    python scripts/convert_data.py            convert every CSV in data/
+    python scripts/convert_data.py train.csv  convert selected files
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Allow `python scripts/convert_data.py` to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import columnar
+from app.titanic import COLUMNAR_DIR, COLUMN_TYPES, DATA_DIR, load_csv, load_table
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def convert(csv_path):
+    """Convert one CSV and report sizes and load times"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    out_dir = os.path.join(COLUMNAR_DIR, name)
+
+    started = time.perf_counter()
+    table = load_csv(csv_path)
+    parse_ms = (time.perf_counter() - started) * 1000
+
+    meta = columnar.write_table(table, COLUMN_TYPES, csv_path, out_dir)
+
+    started = time.perf_counter()
+    load_table(csv_path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    print(f"✓ {os.path.basename(csv_path)} → {os.path.relpath(out_dir)} "
+          f"({meta['rows']} rows, {len(meta['columns'])} columns, "
+          f"{os.path.getsize(csv_path) / 1024:.1f} KB → {directory_size(out_dir) / 1024:.1f} KB)")
+    print(f"  CSV parse {parse_ms:.1f} ms, memory-mapped load {load_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert data/*.csv to memory-mappable columnar files')
+    parser.add_argument('files', nargs='*', help='CSV files in data/ (default: all)')
+    args = parser.parse_args()
+
+    paths = [os.path.join(DATA_DIR, os.path.basename(name)) for name in args.files] or \
+        sorted(glob.glob(os.path.join(DATA_DIR, '*.csv')))
+    if not paths:
+        print(f"⚠ No CSV files found in {DATA_DIR}")
+        sys.exit(1)
+
+    os.makedirs(COLUMNAR_DIR, exist_ok=True)
+    for path in paths:
+        convert(path)
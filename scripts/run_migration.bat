@@ -1,7 +1,7 @@
 @echo off
 echo Running Database Migration...
 echo ==========================================
-python migrate_add_content_images.py
+python init_db.py
 echo.
 echo ==========================================
 echo Migration complete! Press any key to close...
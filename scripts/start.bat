@@ -17,7 +17,7 @@ if errorlevel 1 (
 
 echo.
 echo Installing/updating required packages...
-python -m pip install --quiet Flask==3.0.0 Flask-SQLAlchemy==3.1.1 Flask-Login==0.6.3 Flask-Migrate==4.0.5 Flask-WTF==1.2.1 python-dotenv==1.0.0 markdown2==2.4.12
+python -m pip install --quiet Flask==3.0.0 Flask-SQLAlchemy==3.1.1 Flask-Login==0.6.3 Flask-Migrate==4.0.5 Flask-WTF==1.2.1 python-dotenv==1.0.0 markdown2==2.4.12 Pillow==12.3.0 numpy==2.4.6
 
 if errorlevel 1 (
     echo.
@@ -29,7 +29,7 @@ if errorlevel 1 (
 
 echo.
 echo Initializing database...
-python -c "from app import create_app, db; from app.models import User; from config import Config; app = create_app(); app.app_context().push(); db.create_all(); admin = User.query.filter_by(username=Config.ADMIN_USERNAME).first(); admin = admin or User(username=Config.ADMIN_USERNAME, email=Config.ADMIN_EMAIL); admin.set_password(Config.ADMIN_PASSWORD) if not admin.id else None; db.session.add(admin); db.session.commit(); print('Database ready!')"
+python -c "from app import create_app, init_migrate, db; from app.models import User; from config import Config; from flask_migrate import upgrade; app = create_app(); init_migrate(app); app.app_context().push(); upgrade(); admin = User.query.filter_by(username=Config.ADMIN_USERNAME).first(); admin = admin or User(username=Config.ADMIN_USERNAME, email=Config.ADMIN_EMAIL); admin.set_password(Config.ADMIN_PASSWORD) if not admin.id else None; db.session.add(admin); db.session.commit(); print('Database ready!')"
 
 echo.
 echo Starting Flask server...
@@ -5,20 +5,22 @@ import os
 import sys
 import subprocess
 
-# Add current directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def run_migration():
-    """Run the migration script"""
+    """Apply any pending schema migrations"""
     print("Checking database migration...")
     print("=" * 60)
     
-    try:
-        # Import and run migration
-        from migrate_add_content_images import migrate_database
-        migrate_database()
-    except Exception as e:
-        print(f"Migration check completed (may have already run): {e}")
+    from flask_migrate import upgrade
+    from app import create_app, init_migrate
+    
+    app = create_app()
+    init_migrate(app)
+    with app.app_context():
+        upgrade()
+    print("✓ Database schema is up to date")
     
     print("=" * 60)
     print()
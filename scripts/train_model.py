@@ -0,0 +1,116 @@
+"""
+Train the Titanic baseline model
+Fits a logistic regression on data/train.csv, reports accuracy on the
+training set and on the true test outcomes (data/test_true.csv), saves the
+model to data/models/ and benchmarks batch against per-row scoring.
+
+Usage:
+    python scripts/train_model.py                 train, evaluate and save
+    python scripts/train_model.py --no-benchmark  skip the scoring benchmark
+    python scripts/train_model.py --l2 0.5        fixed regularization strength
+
+By default the L2 strength is chosen by 5-fold cross-validation on the
+training set; the test outcomes are only used for the final report.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# Allow `python scripts/train_model.py` to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app import titanic
+from app.titanic_model import FEATURES, MODEL_PATH, fit, table_columns
+
+L2_GRID = (0.1, 0.3, 1, 3, 10, 30, 100)
+
+
+def accuracy(model, table):
+    return float(np.mean(model.predict(table_columns(table)) == np.asarray(table['Survived'])))
+
+
+def choose_l2(columns, survived, folds=5, seed=0):
+    """L2 strength with the best mean cross-validated accuracy on the training set"""
+    survived = np.asarray(survived)
+    fold_of_row = np.random.default_rng(seed).permutation(len(survived)) % folds
+    scores = {}
+    for l2 in L2_GRID:
+        correct = 0
+        for fold in range(folds):
+            held_out = fold_of_row == fold
+            train_rows = {field: values[~held_out] for field, values in columns.items()}
+            test_rows = {field: values[held_out] for field, values in columns.items()}
+            model, _ = fit(train_rows, survived[~held_out], l2=l2)
+            correct += int((model.predict(test_rows) == survived[held_out]).sum())
+        scores[l2] = correct / len(survived)
+    best = max(L2_GRID, key=lambda l2: scores[l2])
+    print("Cross-validated accuracy by L2 strength: " +
+          ', '.join(f"{l2:g}: {score:.1%}" for l2, score in scores.items()))
+    return best
+
+
+def benchmark(model, columns, repeat=250):
+    """Rows/sec scoring a large batch at once versus one passenger per call"""
+    rows = len(columns['Pclass'])
+    batch = {field: np.tile(values, repeat) for field, values in columns.items()}
+
+    started = time.perf_counter()
+    model.predict_proba(batch)
+    batch_rate = rows * repeat / (time.perf_counter() - started)
+
+    singles = [{field: values[i:i + 1] for field, values in columns.items()} for i in range(rows)]
+    started = time.perf_counter()
+    for passenger in singles:
+        model.predict_proba(passenger)
+    row_rate = rows / (time.perf_counter() - started)
+
+    print(f"\nScoring benchmark ({rows * repeat} rows batched, {rows} rows one at a time):")
+    print(f"  Batch:   {batch_rate:>12,.0f} rows/sec")
+    print(f"  Per row: {row_rate:>12,.0f} rows/sec")
+    print(f"  Speed-up: {batch_rate / row_rate:.0f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the Titanic logistic regression model')
+    parser.add_argument('--l2', type=float, help='L2 regularization strength (default: chosen by cross-validation)')
+    parser.add_argument('--no-benchmark', action='store_true', help='Skip the scoring benchmark')
+    args = parser.parse_args()
+
+    train = titanic.get_table('train')
+    test = titanic.get_table(titanic.SCORING_DATASET)
+
+    columns = table_columns(train)
+    l2 = args.l2 if args.l2 is not None else choose_l2(columns, train['Survived'])
+
+    started = time.perf_counter()
+    model, iterations = fit(columns, train['Survived'], l2=l2)
+    fit_ms = (time.perf_counter() - started) * 1000
+
+    train_accuracy = accuracy(model, train)
+    test_accuracy = accuracy(model, test)
+    baseline = titanic.score_baseline()['accuracy']
+    model.meta = {
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': train.rows,
+        'l2': l2,
+        'iterations': iterations,
+        'train_accuracy': train_accuracy,
+        'test_accuracy': test_accuracy,
+    }
+    model.save()
+
+    print(f"✓ Trained on {train.rows} passengers in {fit_ms:.1f} ms (L2 {l2:g}, {iterations} Newton iterations)")
+    print(f"  Train accuracy:            {train_accuracy:.2%}")
+    print(f"  Test accuracy (test_true): {test_accuracy:.2%}")
+    print(f"  Gender baseline:           {baseline:.2%}")
+    print(f"✓ Saved {os.path.relpath(MODEL_PATH)}")
+
+    print("\nLargest weights (standardized features):")
+    for index in np.argsort(-np.abs(model.weights))[:6]:
+        print(f"  {FEATURES[index]:<14} {model.weights[index]:+.3f}")
+
+    if not args.no_benchmark:
+        benchmark(model, table_columns(test))
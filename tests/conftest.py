@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def backup():
+    """scripts/backup.py, imported as a module"""
+    spec = importlib.util.spec_from_file_location('backup', os.path.join(ROOT, 'scripts', 'backup.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Factory for an app on a fresh SQLite database with uploads under tmp_path"""
+    from app import create_app
+    from app.models import db
+    from config import Config
+
+    def factory(**settings):
+        upload_folder = tmp_path / 'uploads'
+        upload_folder.mkdir(exist_ok=True)
+
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+            SQLALCHEMY_BINDS = {}
+            UPLOAD_FOLDER = str(upload_folder)
+            JINJA_BYTECODE_CACHE = False
+            WTF_CSRF_ENABLED = False
+
+        for name, value in settings.items():
+            setattr(TestConfig, name, value)
+
+        app = create_app(TestConfig)
+        with app.app_context():
+            db.create_all()
+        return app
+
+    return factory
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+
+def make_database(path):
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE project (id INTEGER PRIMARY KEY, title TEXT)')
+    connection.execute("INSERT INTO project (title) VALUES ('First')")
+    connection.commit()
+    connection.close()
+
+
+def stored_objects(backup_dir):
+    objects_dir = os.path.join(backup_dir, 'objects')
+    return [name for root, dirs, files in os.walk(objects_dir) for name in files]
+
+
+def test_unchanged_database_snapshot_dedupes(backup, tmp_path, monkeypatch):
+    db_path = tmp_path / 'portfolio.db'
+    make_database(db_path)
+    backup_dir = str(tmp_path / 'backups')
+    url = f'sqlite:///{db_path}'
+
+    # Separate runs are separate processes, so their temp files have different names
+    monkeypatch.setattr(os, 'getpid', lambda: 1111)
+    first = backup.snapshot_database(backup_dir, url)
+    monkeypatch.setattr(os, 'getpid', lambda: 2222)
+    second = backup.snapshot_database(backup_dir, url)
+
+    assert first['raw_sha256'] == second['raw_sha256']
+    assert first['sha256'] == second['sha256']
+    assert stored_objects(backup_dir) == [first['sha256']]
+
+
+def write_manifest(backup_dir, name, files, database=None):
+    manifest_dir = os.path.join(backup_dir, 'manifests')
+    os.makedirs(manifest_dir, exist_ok=True)
+    with open(os.path.join(manifest_dir, name), 'w', encoding='utf-8') as f:
+        json.dump({'files': files, 'database': database}, f)
+
+
+def store_bytes(backup, backup_dir, tmp_path, data):
+    source = tmp_path / 'source.bin'
+    source.write_bytes(data)
+    sha256 = hashlib.sha256(data).hexdigest()
+    backup.store_object(backup_dir, str(source), sha256)
+    return sha256
+
+
+@pytest.mark.parametrize('relpath', ['../../escaped.txt', 'projects/../../../../../escaped.txt', '{tmp}/escaped.txt'])
+def test_restore_rejects_upload_paths_outside_target(backup, tmp_path, relpath):
+    relpath = relpath.format(tmp=tmp_path)
+    backup_dir = str(tmp_path / 'backups')
+    target_dir = tmp_path / 'restore'
+    sha256 = store_bytes(backup, backup_dir, tmp_path, b'payload')
+    write_manifest(backup_dir, 'crafted.json', {'projects/ok.txt': {'sha256': sha256}, relpath: {'sha256': sha256}})
+
+    with pytest.raises(ValueError, match='unsafe path'):
+        backup.restore_backup('crafted.json', str(target_dir), backup_dir)
+
+    # Nothing is written, not even the valid entry
+    assert not target_dir.exists()
+    assert not (tmp_path / 'escaped.txt').exists()
+
+
+def test_restore_writes_uploads_under_target(backup, tmp_path):
+    backup_dir = str(tmp_path / 'backups')
+    target_dir = tmp_path / 'restore'
+    sha256 = store_bytes(backup, backup_dir, tmp_path, b'payload')
+    write_manifest(backup_dir, 'ok.json', {'projects/ok.txt': {'sha256': sha256}})
+
+    backup.restore_backup('ok.json', str(target_dir), backup_dir)
+
+    assert (target_dir / backup.UPLOADS_DIR / 'projects' / 'ok.txt').read_bytes() == b'payload'
+
+
+def test_cleanup_only_expires_legacy_backups(backup, tmp_path):
+    backup_dir = tmp_path / 'backups'
+    (backup_dir / 'uploads_20240101_000000').mkdir(parents=True)
+    names = ['portfolio_20240101_000000.db', 'backup_20240101_000000.tar.zst',
+             'backup_20240101_000000.tar.gz', 'backup_20240102_000000.tar.zst.partial', 'notes.txt']
+    for name in names:
+        (backup_dir / name).write_bytes(b'old')
+    month_ago = time.time() - 60 * 24 * 3600
+    for item in backup_dir.iterdir():
+        os.utime(item, (month_ago, month_ago))
+
+    backup.cleanup_old_backups(str(backup_dir), days=30)
+
+    assert sorted(item.name for item in backup_dir.iterdir()) == sorted(names[1:])
+
+
+def test_backups_in_the_same_second_keep_separate_manifests(backup, tmp_path, monkeypatch):
+    db_path = tmp_path / 'portfolio.db'
+    make_database(db_path)
+    monkeypatch.setattr(backup.Config, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{db_path}')
+    monkeypatch.chdir(tmp_path)
+    backup_dir = str(tmp_path / 'backups')
+
+    moments = iter([datetime(2025, 1, 1, 12, 0, 0, 100), datetime(2025, 1, 1, 12, 0, 0, 200)])
+
+    class FrozenDatetime(datetime):
+        current = None
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(backup, 'datetime', FrozenDatetime)
+    names = []
+    for moment in moments:
+        FrozenDatetime.current = moment
+        names.append(backup.create_backup(backup_dir))
+
+    assert len(set(names)) == 2
+    assert backup.list_manifests(backup_dir) == names
+
+    # A clash on the exact same timestamp fails instead of replacing the earlier manifest
+    with pytest.raises(FileExistsError):
+        backup.create_backup(backup_dir)
+    assert backup.list_manifests(backup_dir) == names
@@ -0,0 +1,34 @@
+import pytest
+from PIL import Image
+
+from app.images import normalize_image
+
+
+def test_decompression_bomb_is_not_a_valid_image(tmp_path, monkeypatch):
+    path = tmp_path / 'bomb.png'
+    Image.new('L', (200, 200)).save(path)
+    # Anything over twice this many pixels is rejected as a decompression bomb
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+
+    with pytest.raises(ValueError, match='Not a valid image'):
+        normalize_image(str(path))
+
+
+def test_truncated_image_is_not_a_valid_image(tmp_path):
+    path = tmp_path / 'truncated.png'
+    Image.effect_noise((300, 300), 50).save(path)
+    path.write_bytes(path.read_bytes()[:2000])
+
+    with pytest.raises(ValueError, match='Not a valid image'):
+        normalize_image(str(path))
+
+
+def test_palette_transparency_survives_normalization(tmp_path):
+    path = tmp_path / 'logo.png'
+    image = Image.new('P', (3000, 40), 0)
+    image.putpalette([255, 255, 255, 255, 0, 0] + [0] * 762)
+    image.save(path, transparency=0)
+
+    assert normalize_image(str(path)) == (2000, 27)
+    with Image.open(path) as normalized:
+        assert normalized.info.get('transparency') == 0
@@ -0,0 +1,61 @@
+import io
+import warnings
+
+import pytest
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf', 'NaN', 'Infinity', 'abc'])
+def test_explorer_json_rejects_bad_bounds(client, value):
+    response = client.get(f'/data/titanic.json?age_min={value}')
+
+    assert response.status_code == 400
+    assert 'age_min' in response.get_json()['error']
+
+
+def test_explorer_page_rejects_non_finite_bounds(client):
+    assert client.get('/data/titanic?fare_max=inf').status_code == 400
+
+
+def test_explorer_applies_finite_bounds_and_ignores_empty_ones(client):
+    response = client.get('/data/titanic.json?age_min=60&age_max=&fare_min=')
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['filters']['age_min'] == 60
+    assert result['filters']['age_max'] is None
+    assert 0 < result['summary']['passengers'] < 891
+
+
+def post_submission(client, body):
+    return client.post('/data/titanic/score.json', content_type='multipart/form-data',
+                       data={'submission': (io.BytesIO(body), 'submission.csv')})
+
+
+@pytest.mark.parametrize('passenger_id', ['inf', '-inf', 'nan', '1e30', '-5', '892.5'])
+def test_scoring_rejects_bad_passenger_ids(client, passenger_id):
+    body = f'PassengerId,Survived\n892,0\n{passenger_id},1\n'.encode()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        response = post_submission(client, body)
+
+    assert response.status_code == 400
+    assert 'PassengerId' in response.get_json()['error']
+
+
+def test_scoring_rejects_non_utf8_files(client):
+    response = post_submission(client, b'\xff\xfeP\x00a\x00')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'File must be UTF-8 CSV'
+
+
+def test_scoring_accepts_a_valid_submission(client):
+    response = post_submission(client, b'PassengerId,Survived\n892,0\n893,1\n')
+
+    assert response.status_code == 200
+    assert response.get_json()['accuracy'] == 1.0
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+UPLOAD_URL = '/static/uploads/projects/photo.jpg'
+
+
+@pytest.fixture
+def upload(tmp_path):
+    """A stored upload at uploads/projects/photo.jpg"""
+    path = tmp_path / 'uploads' / 'projects' / 'photo.jpg'
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'\xff\xd8\xff fake jpeg bytes')
+    return path
+
+
+def test_default_mode_sends_the_file(make_app, upload):
+    client = make_app(UPLOAD_SENDFILE=None).test_client()
+    response = client.get(UPLOAD_URL)
+
+    assert response.status_code == 200
+    assert response.data == upload.read_bytes()
+    assert response.mimetype == 'image/jpeg'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'X-Accel-Redirect' not in response.headers
+    assert 'X-Sendfile' not in response.headers
+
+
+def test_x_accel_redirect_hands_off_to_nginx(make_app, upload):
+    client = make_app(UPLOAD_SENDFILE='x-accel-redirect', UPLOAD_ACCEL_PREFIX='/protected-uploads/').test_client()
+    response = client.get(UPLOAD_URL)
+
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == '/protected-uploads/projects/photo.jpg'
+    assert response.data == b''
+    assert response.mimetype == 'image/jpeg'
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+def test_x_sendfile_names_the_absolute_path(make_app, upload):
+    client = make_app(UPLOAD_SENDFILE='x-sendfile').test_client()
+    response = client.get(UPLOAD_URL)
+
+    assert response.status_code == 200
+    assert os.path.samefile(response.headers['X-Sendfile'], upload)
+    assert response.data == b''
+    assert response.mimetype == 'image/jpeg'
+
+
+@pytest.mark.parametrize('mode', [None, 'x-accel-redirect', 'x-sendfile'])
+def test_conditional_requests_get_304(make_app, upload, mode):
+    client = make_app(UPLOAD_SENDFILE=mode).test_client()
+    first = client.get(UPLOAD_URL)
+    assert first.headers.get('ETag')
+    assert first.headers.get('Last-Modified')
+
+    by_etag = client.get(UPLOAD_URL, headers={'If-None-Match': first.headers['ETag']})
+    assert by_etag.status_code == 304
+
+    by_date = client.get(UPLOAD_URL, headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert by_date.status_code == 304
+
+
+@pytest.mark.parametrize('mode', [None, 'x-accel-redirect', 'x-sendfile'])
+@pytest.mark.parametrize('filename', ['../test.db', '..%2Ftest.db', 'projects/../../test.db', 'missing.jpg'])
+def test_traversal_and_missing_files_are_404(make_app, upload, mode, filename):
+    client = make_app(UPLOAD_SENDFILE=mode).test_client()
+    response = client.get(f'/static/uploads/{filename}')
+
+    assert response.status_code == 404
+    assert 'X-Accel-Redirect' not in response.headers
+    assert 'X-Sendfile' not in response.headers